@@ -5,29 +5,196 @@ Provides common functionality: logging, memory management, MCP integration
 """
 import os
 import sys
+import io
 import json
+import hashlib
+import time
+import queue
+import string
+import atexit
+import dataclasses
+import functools
+import sqlite3
+import threading
 import logging
-from datetime import datetime
+import logging.handlers
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import asyncio
 
+try:
+    import orjson
+    # Accept int/enum keys like the stdlib encoder and NumPy values from the agents
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional
+    uvloop = None
+
 # Add parent directory to path for MCP server imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/home/keith/chat-copilot/ai-agents/logs/agents.log'),
-        logging.StreamHandler()
-    ]
-)
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Configure logging - records are queued and written by a background listener
+# thread so file/console I/O stays off the asyncio loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('/home/keith/chat-copilot/ai-agents/logs/agents.log', delay=True),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def freeze(obj: Any) -> Any:
+    """Recursively convert dicts/lists to read-only MappingProxyType/tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+def day_stamp(when: datetime) -> str:
+    """YYYYMMDD key for daily contexts, built from the date fields without strftime"""
+    return f"{when.year:04d}{when.month:02d}{when.day:02d}"
+
+def _json_default(obj: Any) -> Any:
+    """Serialize read-only mappings, datetimes, dataclasses and NumPy values"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    # orjson encodes the rest natively; the stdlib fallback needs them spelled out
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: asdict() deep-copies fields and cannot copy frozen (mappingproxy) values
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTS | orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=_json_default)
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTS)
+    return json.dumps(obj, default=_json_default).encode()
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _blob_digest(blob: bytes) -> bytes:
+    """Short content hash used to skip rewriting unchanged contexts"""
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+# Execution report layout, parsed once at import
+_RULE = '=' * 70
+_REPORT_TMPL = string.Template(f"""
+{_RULE}
+Agent Execution Report
+{_RULE}
+Agent: $name
+Role: $role
+Started: $started
+Duration: $duration seconds
+Status: $status
+{_RULE}
+
+Results:
+$body
+""")
+
+# Seconds a loaded context is reused before re-reading the store
+CONTEXT_CACHE_TTL = 60.0
+
+# Metric batching thresholds
+METRIC_FLUSH_SIZE = 128
+METRIC_FLUSH_INTERVAL = 0.5  # seconds
+
+# Steps an agent runs at once in gather_steps() (config "max_concurrency" overrides)
+DEFAULT_MAX_CONCURRENCY = 4
+
+# HTTP connection pool for agent sessions - see new_http_session()
+HTTP_POOL_LIMIT = 32
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_DNS_CACHE_TTL = 300
+HTTP_TIMEOUT = 15  # seconds per request
+
+# Per-item lookups fan_out() runs at once (config "fetch_concurrency" overrides)
+DEFAULT_FETCH_CONCURRENCY = 8
+
+# Outbound requests in flight per host across all agents in the process
+# (a host also matches its subdomains; config "host_concurrency" overrides)
+HOST_CONCURRENCY = {"sam.gov": 4, "gsa.gov": 4}
+DEFAULT_HOST_CONCURRENCY = 16
+
+def run_async(main: Any) -> Any:
+    """Run a coroutine to completion, on uvloop when it is installed"""
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop is not None else None) as runner:
+        return runner.run(main)
+
+def new_http_session() -> Any:
+    """aiohttp session with the shared keep-alive pool limits (call on the event loop)"""
+    import aiohttp
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST, ttl_dns_cache=HTTP_DNS_CACHE_TTL
+        ),
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    )
 
 class BaseAgent:
     """Base class for all AI agents"""
 
+    # Fixed per-instance state - subclasses declare their own __slots__ too
+    __slots__ = (
+        "name", "role", "config", "logger", "start_time",
+        "workspace", "logs_dir", "cache_dir",
+        "ctx_db", "_pending_context", "_context_cache", "_context_hashes", "_step_sem",
+        "http", "_own_http"
+    )
+
+    # Shared metric writers, keyed by metrics file
+    _metric_handles: Dict[Path, io.BufferedWriter] = {}
+    _metric_buffers: Dict[Path, deque] = {}
+    _metric_last_flush: Dict[Path, float] = {}
+    _metric_lock = threading.Lock()
+
+    # Directories already created by this process
+    _ensured: set = set()
+
+    # Context writes are deferred while inside batch_writes()
+    _batch_depth = 0
+    _batched_agents: set = set()
+
+    # Process-wide per-host request limits - see _host_slot()
+    _host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    _host_semaphores_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self, name: str, role: str, config: Optional[Dict] = None):
         self.name = name
         self.role = role
@@ -41,32 +208,243 @@ class BaseAgent:
         self.cache_dir = self.workspace / "cache" / name.lower().replace(" ", "_")
 
         # Create directories
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure(self.cache_dir)
+        self._ensure(self.logs_dir)
+
+        # Context store - one SQLite DB per agent, opened once in autocommit mode
+        self.ctx_db = sqlite3.connect(
+            str(self.cache_dir / "ctx.db"), isolation_level=None, check_same_thread=False
+        )
+        self.ctx_db.execute("PRAGMA journal_mode=WAL")
+        self.ctx_db.execute("PRAGMA synchronous=NORMAL")
+        self.ctx_db.execute(
+            "CREATE TABLE IF NOT EXISTS ctx (context_id TEXT PRIMARY KEY, ts REAL, data BLOB)"
+        )
+        # Validators and bodies of fetched URLs for conditional GETs - see fetch_conditional()
+        self.ctx_db.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB)"
+        )
+        self._pending_context: Dict[str, Tuple[str, float, bytes]] = {}
+
+        # context_id -> (monotonic load time, parsed data or None)
+        self._context_cache: Dict[str, Tuple[float, Any]] = {}
+
+        # context_id -> hash of the last payload saved, so unchanged saves are skipped
+        self._context_hashes: Dict[str, bytes] = {}
+
+        # Bounds the agent's own concurrent steps - see gather_steps()
+        self._step_sem = asyncio.Semaphore(self.config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+
+        # Shared aiohttp session, injected by the orchestrator (None when run standalone)
+        self.http: Optional[Any] = None
+
+        # Session this agent opened itself in http_session(), closed by aclose()
+        self._own_http: Optional[Any] = None
+
+        self.logger.info("🤖 %s initialized - Role: %s", self.name, self.role)
 
-        self.logger.info(f"🤖 {self.name} initialized - Role: {self.role}")
+    @classmethod
+    def _ensure(cls, path: Path) -> None:
+        """Create a directory once per process"""
+        if path in cls._ensured:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        cls._ensured.add(path)
 
     def save_context(self, context_id: str, data: Dict[str, Any]) -> None:
-        """Save context data to cache"""
-        cache_file = self.cache_dir / f"{context_id}.json"
-        with open(cache_file, 'w') as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "agent": self.name,
-                "data": data
-            }, f, indent=2)
-        self.logger.debug(f"💾 Saved context: {context_id}")
-
-    def load_context(self, context_id: str) -> Optional[Dict[str, Any]]:
-        """Load context data from cache"""
-        cache_file = self.cache_dir / f"{context_id}.json"
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-            self.logger.debug(f"📂 Loaded context: {context_id}")
-            return data.get("data")
+        """Save context data to cache (deferred inside batch_writes(), skipped if unchanged)"""
+        blob = _dumps_bytes(data)
+        digest = self._context_digest(context_id, blob)
+        if digest is None:
+            return
+        row = (context_id, time.time(), blob)
+        self._context_cache.pop(context_id, None)
+        if BaseAgent._batch_depth:
+            # Hash recorded by _flush_context once the row is committed
+            self._pending_context[context_id] = row
+            BaseAgent._batched_agents.add(self)
+        else:
+            self.ctx_db.execute("INSERT OR REPLACE INTO ctx VALUES (?, ?, ?)", row)
+            self._context_hashes[context_id] = digest
+            # A deferred row left by a failed flush is now stale
+            self._pending_context.pop(context_id, None)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("💾 Saved context: %s", context_id)
+
+    def save_context_batch(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Save several contexts in one transaction"""
+        now = time.time()
+        rows = []
+        digests = {}
+        for context_id, data in items.items():
+            blob = _dumps_bytes(data)
+            digest = self._context_digest(context_id, blob)
+            if digest is not None:
+                self._context_cache.pop(context_id, None)
+                rows.append((context_id, now, blob))
+                digests[context_id] = digest
+        self._write_context_rows(rows)
+        self._context_hashes.update(digests)
+        for context_id in digests:
+            self._pending_context.pop(context_id, None)
+
+    def _context_digest(self, context_id: str, blob: bytes) -> Optional[bytes]:
+        """Hash of the payload, or None if the store already holds it under context_id"""
+        digest = _blob_digest(blob)
+        if self._context_hashes.get(context_id) != digest:
+            return digest
+        # Saving the committed payload again supersedes any newer deferred write
+        if self._pending_context.pop(context_id, None) is not None:
+            self._context_cache.pop(context_id, None)
         return None
 
+    def _write_context_rows(self, rows: List[Tuple[str, float, bytes]]) -> None:
+        """Insert context rows in a single transaction"""
+        if not rows:
+            return
+        self.ctx_db.execute("BEGIN")
+        try:
+            self.ctx_db.executemany("INSERT OR REPLACE INTO ctx VALUES (?, ?, ?)", rows)
+        except Exception:
+            self.ctx_db.execute("ROLLBACK")
+            raise
+        self.ctx_db.execute("COMMIT")
+
+    def _flush_context(self) -> None:
+        """Write contexts deferred by batch_writes()"""
+        rows = list(self._pending_context.values())
+        self._write_context_rows(rows)
+        # Only forget the rows (and trust their hashes) once they are committed
+        self._pending_context.clear()
+        self._context_hashes.update((row[0], _blob_digest(row[2])) for row in rows)
+
+    @staticmethod
+    @contextmanager
+    def batch_writes() -> Iterator[None]:
+        """Defer save_context calls of all agents until the block exits"""
+        BaseAgent._batch_depth += 1
+        try:
+            yield
+        finally:
+            BaseAgent._batch_depth -= 1
+            if not BaseAgent._batch_depth:
+                agents = list(BaseAgent._batched_agents)
+                BaseAgent._batched_agents.clear()
+                for agent in agents:
+                    try:
+                        agent._flush_context()
+                    except Exception as e:
+                        # Keep the rows pending for the next batch and flush the other agents
+                        BaseAgent._batched_agents.add(agent)
+                        agent.logger.error("❌ Context flush failed: %s", e)
+
+    def load_context(self, context_id: str, ttl_seconds: float = CONTEXT_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """Load context data from cache (parsed result reused for ttl_seconds)"""
+        pending = self._pending_context.get(context_id)
+        if pending is not None:
+            return _loads(pending[2])
+
+        now = time.monotonic()
+        cached = self._context_cache.get(context_id)
+        if cached is not None and now - cached[0] < ttl_seconds:
+            return cached[1]
+
+        row = self.ctx_db.execute(
+            "SELECT data FROM ctx WHERE context_id = ?", (context_id,)
+        ).fetchone()
+        data = _loads(row[0]) if row is not None else None
+        self._context_cache[context_id] = (now, data)
+        if data is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("📂 Loaded context: %s", context_id)
+        return data
+
+    async def gather_steps(self, *steps) -> List[Any]:
+        """Await independent step coroutines concurrently, max_concurrency at a time"""
+        async def bounded(step):
+            async with self._step_sem:
+                return await step
+        return await asyncio.gather(*(bounded(step) for step in steps))
+
+    async def fan_out(self, fetch, items: Iterable[Any], limit: Optional[int] = None) -> List[Any]:
+        """Await fetch(item) for every item, limit (default fetch_concurrency) at a time, results in item order"""
+        # Own semaphore per call so a fan-out inside a gathered step never waits on _step_sem
+        sem = asyncio.Semaphore(limit or self.config.get("fetch_concurrency", DEFAULT_FETCH_CONCURRENCY))
+        async def bounded(item):
+            async with sem:
+                return await fetch(item)
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+    async def http_session(self) -> Any:
+        """Shared HTTP session, opening one for this agent when none was injected"""
+        if self.http is None or self.http.closed:
+            if self._own_http is None or self._own_http.closed:
+                self._own_http = new_http_session()
+            self.http = self._own_http
+        return self.http
+
+    async def fetch_conditional(self, url: str) -> bytes:
+        """GET url, sending the last ETag/Last-Modified and reusing the stored body on 304"""
+        cached = self.ctx_db.execute(
+            "SELECT etag, last_modified, body FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        headers = {}
+        if cached is not None:
+            if cached[0]:
+                headers["If-None-Match"] = cached[0]
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
+
+        session = await self.http_session()
+        async with self._host_slot(urlsplit(url).hostname or ""), session.get(url, headers=headers) as resp:
+            if resp.status == 304 and cached is not None:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("🌐 Not modified: %s", url)
+                return cached[2]
+            resp.raise_for_status()
+            body = await resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+
+        if etag or last_modified:
+            self.ctx_db.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?)", (url, etag, last_modified, body)
+            )
+        return body
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        """Semaphore shared by every agent for requests to host"""
+        # Semaphores belong to one event loop; start afresh when a new loop runs
+        loop = asyncio.get_running_loop()
+        if BaseAgent._host_semaphores_loop is not loop:
+            BaseAgent._host_semaphores = {}
+            BaseAgent._host_semaphores_loop = loop
+        sem = BaseAgent._host_semaphores.get(host)
+        if sem is None:
+            limits = self.config.get("host_concurrency", HOST_CONCURRENCY)
+            limit = next(
+                (n for suffix, n in limits.items() if host == suffix or host.endswith("." + suffix)),
+                DEFAULT_HOST_CONCURRENCY
+            )
+            sem = BaseAgent._host_semaphores[host] = asyncio.Semaphore(limit)
+        return sem
+
+    async def aclose(self) -> None:
+        """Close the HTTP session this agent opened (an injected one is left to its owner)"""
+        if self._own_http is not None:
+            if self.http is self._own_http:
+                self.http = None
+            if not self._own_http.closed:
+                await self._own_http.close()
+            self._own_http = None
+
+    async def asave_context(self, context_id: str, data: Dict[str, Any]) -> None:
+        """Save context data without blocking the event loop"""
+        await asyncio.to_thread(self.save_context, context_id, data)
+
+    async def aload_context(self, context_id: str, ttl_seconds: float = CONTEXT_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """Load context data without blocking the event loop"""
+        return await asyncio.to_thread(self.load_context, context_id, ttl_seconds)
+
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single task - override in specialized agents"""
         raise NotImplementedError("Specialized agents must implement execute_task()")
@@ -75,36 +453,96 @@ class BaseAgent:
         """Main execution loop - override in specialized agents"""
         raise NotImplementedError("Specialized agents must implement run()")
 
+    def submit(self) -> "asyncio.Task[Dict[str, Any]]":
+        """Start run() in the background and return its task (call from the event loop)"""
+        return asyncio.create_task(self.run(), name=f"{self.name} run")
+
+    async def collect(self, task: "asyncio.Task[Dict[str, Any]]") -> Dict[str, Any]:
+        """Wait for a task returned by submit() and return its results"""
+        return await task
+
     def generate_report(self, results: Dict[str, Any]) -> str:
         """Generate execution report"""
         duration = (datetime.now() - self.start_time).total_seconds()
 
-        report = f"""
-{'=' * 70}
-Agent Execution Report
-{'=' * 70}
-Agent: {self.name}
-Role: {self.role}
-Started: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}
-Duration: {duration:.2f} seconds
-Status: {'✅ Complete' if results.get('success') else '❌ Failed'}
-{'=' * 70}
-
-Results:
-{json.dumps(results, indent=2)}
-"""
-        return report
+        return _REPORT_TMPL.substitute(
+            name=self.name,
+            role=self.role,
+            started=self.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            duration=f"{duration:.2f}",
+            status='✅ Complete' if results.get('success') else '❌ Failed',
+            body=_dumps_indented(results)
+        )
 
     def log_metric(self, metric_name: str, value: Any) -> None:
-        """Log performance metric"""
+        """Log performance metric (buffered, flushed in batches)"""
+        self._buffer_metrics(((metric_name, value),))
+
+    def log_metrics(self, **metrics: Any) -> None:
+        """Log several performance metrics with one timestamp and one flush check"""
+        self._buffer_metrics(metrics.items())
+
+    def _buffer_metrics(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Queue (metric, value) pairs for the metrics file, flushing when due"""
         metrics_file = self.logs_dir / "metrics.jsonl"
-        with open(metrics_file, 'a') as f:
-            f.write(json.dumps({
-                "timestamp": datetime.now().isoformat(),
-                "agent": self.name,
-                "metric": metric_name,
-                "value": value
-            }) + "\n")
+        # Raw epoch time; formatted once per batch when flushed
+        ts = time.time()
+        rows = [(ts, self.name, metric_name, value) for metric_name, value in items]
+
+        # alog_metric(s) call in from worker threads, so the buffer is only touched under the lock
+        with self._metric_lock:
+            buffer = self._metric_buffers.get(metrics_file)
+            if buffer is None:
+                buffer = self._metric_buffers[metrics_file] = deque()
+                self._metric_last_flush[metrics_file] = time.monotonic()
+            buffer.extend(rows)
+            due = (len(buffer) >= METRIC_FLUSH_SIZE or
+                   time.monotonic() - self._metric_last_flush[metrics_file] >= METRIC_FLUSH_INTERVAL)
+
+        if due:
+            self._flush_metrics(metrics_file)
+
+    async def alog_metric(self, metric_name: str, value: Any) -> None:
+        """Log performance metric without blocking the event loop"""
+        await asyncio.to_thread(self.log_metric, metric_name, value)
+
+    async def alog_metrics(self, **metrics: Any) -> None:
+        """Log several performance metrics without blocking the event loop"""
+        await asyncio.to_thread(functools.partial(self.log_metrics, **metrics))
+
+    @classmethod
+    def _flush_metrics(cls, metrics_file: Path) -> None:
+        """Write buffered metric lines for one file in a single write"""
+        with cls._metric_lock:
+            buffer = cls._metric_buffers.get(metrics_file)
+            cls._metric_last_flush[metrics_file] = time.monotonic()
+            if not buffer:
+                return
+
+            handle = cls._metric_handles.get(metrics_file)
+            if handle is None:
+                handle = cls._metric_handles[metrics_file] = open(metrics_file, 'ab', buffering=1 << 16)
+
+            lines = []
+            while buffer:
+                ts, agent, metric_name, value = buffer.popleft()
+                lines.append(_dumps_bytes({
+                    "timestamp": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+                    "agent": agent,
+                    "metric": metric_name,
+                    "value": value
+                }))
+            lines.append(b"")
+            handle.write(b"\n".join(lines))
+            handle.flush()
+
+    @classmethod
+    def flush_metrics(cls) -> None:
+        """Flush all buffered metrics to disk (call when a run ends; buffers only self-flush on the next log_metric)"""
+        for metrics_file in list(cls._metric_buffers):
+            cls._flush_metrics(metrics_file)
+
+atexit.register(BaseAgent.flush_metrics)
 
 if __name__ == "__main__":
     # Test base agent
@@ -6,15 +6,33 @@ Real-time monitoring of all agent activities, metrics, and health
 import os
 import sys
 import json
+import time
+import gzip
+import heapq
+import hashlib
+import sqlite3
 import asyncio
+import threading
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
-from flask import Flask, render_template, jsonify
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from flask import Flask, Response, render_template, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - stdlib fallback
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj).encode()
+
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 app = Flask(__name__)
 CORS(app)
@@ -25,6 +43,22 @@ LOGS_DIR = WORKSPACE / "logs"
 CACHE_DIR = WORKSPACE / "cache"
 REPORTS_DIR = WORKSPACE / "reports"
 
+# Seconds to reuse a directory scan before rescanning
+CACHE_TTL = 5.0
+
+# Seconds between metrics.jsonl checks on the /api/events stream
+EVENTS_POLL_INTERVAL = 1.0
+
+# Seconds an /api/events stream stays open; each stream holds a worker thread, so it ends
+# periodically and the browser's EventSource reconnects from Last-Event-ID
+EVENTS_MAX_LIFETIME = 300.0
+
+# Bytes read from the end of metrics.jsonl per tail attempt
+TAIL_CHUNK = 64 * 1024
+
+# Most recent metrics kept in memory
+METRICS_RING_SIZE = 5000
+
 class AgentDashboard:
     """Monitor and display agent status"""
 
@@ -42,54 +76,142 @@ class AgentDashboard:
             "qa_testing"
         ]
 
-    def get_agent_status(self) -> List[Dict]:
-        """Get current status of all agents"""
-        status_list = []
+        # (agent_id, display name, cache directory) resolved once
+        self._agent_meta = [
+            (agent, agent.replace("_", " ").title(), CACHE_DIR / agent)
+            for agent in self.agents
+        ]
 
-        for agent in self.agents:
-            agent_dir = CACHE_DIR / agent.replace("_", "_")
+        self._ttl = CACHE_TTL
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+        # (status list it was derived from, health summary)
+        self._health_cache: Optional[Tuple[List[Dict], Dict[str, Any]]] = None
+
+        # Parsed metrics plus the (inode, byte offset) they were read up to
+        self._metrics_ring: deque = deque(maxlen=METRICS_RING_SIZE)
+        self._metrics_pos: Tuple[Any, int] = (None, 0)
+        self._metrics_lock = threading.Lock()
+
+    def _cached(self, key: str, builder: Callable[[], Any], force: bool = False) -> Any:
+        """Return a cached value younger than the TTL, rebuilding it otherwise"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if not force and entry is not None and now - entry[0] < self._ttl:
+            return entry[1]
+        value = builder()
+        self._cache[key] = (now, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop all cached scans"""
+        self._cache.clear()
+        self._health_cache = None
+
+    def get_agent_status(self, force: bool = False) -> List[Dict]:
+        """Get current status of all agents"""
+        return self._cached("status", self._scan_agent_status, force)
 
-            # Find most recent cache file
-            cache_files = list(agent_dir.glob("*.json")) if agent_dir.exists() else []
+    def _scan_agent_status(self) -> List[Dict]:
+        """Scan agent cache directories for status"""
+        status_list = []
+        now_ts = time.time()
+
+        for agent, display_name, agent_dir in self._agent_meta:
+            # Latest save and context count from the agent's context store
+            cache_files = 0
+            latest_ts = None
+            ctx_db = agent_dir / "ctx.db"
+            if ctx_db.exists():
+                try:
+                    conn = sqlite3.connect(f"file:{ctx_db}?mode=ro", uri=True)
+                    try:
+                        cache_files, latest_ts = conn.execute(
+                            "SELECT COUNT(*), MAX(ts) FROM ctx"
+                        ).fetchone()
+                    finally:
+                        conn.close()
+                except sqlite3.Error:
+                    pass
 
             if cache_files:
-                latest_file = max(cache_files, key=lambda x: x.stat().st_mtime)
-                last_run = datetime.fromtimestamp(latest_file.stat().st_mtime)
-                status = "active" if (datetime.now() - last_run).seconds < 3600 else "idle"
+                last_run = datetime.fromtimestamp(latest_ts)
+                status = "active" if now_ts - latest_ts < 3600 else "idle"
             else:
                 last_run = None
                 status = "not_started"
 
             status_list.append({
-                "name": agent.replace("_", " ").title(),
+                "name": display_name,
                 "agent_id": agent,
                 "status": status,
                 "last_run": last_run.isoformat() if last_run else None,
-                "cache_files": len(cache_files)
+                "cache_files": cache_files
             })
 
         return status_list
 
     def get_recent_metrics(self, limit: int = 50) -> List[Dict]:
         """Get recent metrics from log file"""
-        metrics_file = LOGS_DIR / "metrics.jsonl"
+        with self._metrics_lock:
+            self._refresh_metrics()
+            recent = list(islice(reversed(self._metrics_ring), limit))
 
-        if not metrics_file.exists():
-            return []
+        recent.reverse()
+        return recent
 
-        metrics = []
-        with open(metrics_file, 'r') as f:
-            lines = f.readlines()
-            for line in lines[-limit:]:
-                try:
-                    metrics.append(json.loads(line))
-                except:
-                    continue
+    def _refresh_metrics(self) -> None:
+        """Parse only the bytes appended to metrics.jsonl since the last call"""
+        metrics_file = LOGS_DIR / "metrics.jsonl"
 
-        return metrics
+        try:
+            st = metrics_file.stat()
+        except FileNotFoundError:
+            self._metrics_ring.clear()
+            self._metrics_pos = (None, 0)
+            return
+
+        inode, offset = self._metrics_pos
+
+        with open(metrics_file, 'rb') as f:
+            if inode != st.st_ino or st.st_size < offset:
+                # New or rotated file - start from the newest records only
+                self._metrics_ring.clear()
+                offset = self._seed_offset(f, st.st_size)
+
+            if st.st_size > offset:
+                f.seek(offset)
+                for line in f.read(st.st_size - offset).splitlines(keepends=True):
+                    if not line.endswith(b"\n"):
+                        break  # partial write, picked up next refresh
+                    offset += len(line)
+                    try:
+                        self._metrics_ring.append(_loads(line))
+                    except ValueError:
+                        continue
+
+        self._metrics_pos = (st.st_ino, offset)
+
+    def _seed_offset(self, f, size: int) -> int:
+        """Byte offset where the newest ring-buffer's worth of lines starts"""
+        window = min(size, TAIL_CHUNK)
+
+        while window < size:
+            f.seek(size - window)
+            chunk = f.read(window)
+            if chunk.count(b"\n") > self._metrics_ring.maxlen:
+                # Skip the first line, which may be cut mid-record
+                return size - window + chunk.index(b"\n") + 1
+            window = min(size, window * 2)
+
+        return 0
 
     def get_summary_metrics(self) -> Dict[str, Any]:
         """Get summary dashboard metrics"""
+        return self._cached("summary", self._build_summary_metrics)
+
+    def _build_summary_metrics(self) -> Dict[str, Any]:
+        """Aggregate summary metrics from recent metric lines"""
         metrics = self.get_recent_metrics(500)
 
         summary = {
@@ -112,16 +234,27 @@ class AgentDashboard:
 
     def get_recent_reports(self) -> List[Dict]:
         """Get list of recent reports"""
-        reports = []
+        return self._cached("reports", self._scan_recent_reports)
+
+    def _scan_recent_reports(self) -> List[Dict]:
+        """Scan the reports directory for the newest reports"""
+        entries = []
+        try:
+            with os.scandir(REPORTS_DIR) as it:
+                for entry in it:
+                    if entry.name.endswith((".txt", ".txt.gz")) and entry.is_file():
+                        entries.append((entry.name, entry.stat()))
+        except FileNotFoundError:
+            return []
 
-        if REPORTS_DIR.exists():
-            for report_file in sorted(REPORTS_DIR.glob("*.txt"), key=lambda x: x.stat().st_mtime, reverse=True)[:10]:
-                reports.append({
-                    "name": report_file.name,
-                    "type": "daily" if "daily" in report_file.name else "weekly",
-                    "date": datetime.fromtimestamp(report_file.stat().st_mtime).isoformat(),
-                    "size": report_file.stat().st_size
-                })
+        reports = []
+        for name, st in heapq.nlargest(10, entries, key=lambda e: e[1].st_mtime):
+            reports.append({
+                "name": name,
+                "type": "daily" if "daily" in name else "weekly",
+                "date": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                "size": st.st_size
+            })
 
         return reports
 
@@ -129,19 +262,69 @@ class AgentDashboard:
         """Get overall system health"""
         status_list = self.get_agent_status()
 
-        active_agents = len([a for a in status_list if a["status"] == "active"])
+        # Reuse the summary while the cached status list is unchanged
+        cached = self._health_cache
+        if cached is not None and cached[0] is status_list:
+            return cached[1]
+
+        active_agents = sum(1 for a in status_list if a["status"] == "active")
         total_agents = len(status_list)
 
-        return {
+        health = {
             "overall_health": "healthy" if active_agents >= total_agents * 0.7 else "degraded",
             "active_agents": active_agents,
             "total_agents": total_agents,
             "health_percentage": round((active_agents / total_agents) * 100, 1)
         }
+        self._health_cache = (status_list, health)
+        return health
+
+def _metric_events(offset: int):
+    """Yield server-sent events for metric lines appended after `offset`, for EVENTS_MAX_LIFETIME seconds"""
+    metrics_file = LOGS_DIR / "metrics.jsonl"
+    deadline = time.monotonic() + EVENTS_MAX_LIFETIME
+
+    while time.monotonic() < deadline:
+        try:
+            size = metrics_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+
+        if size < offset:
+            offset = 0  # file was truncated or rotated
+
+        if size > offset:
+            with open(metrics_file, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read(size - offset)
+
+            # Only emit complete lines; a partial tail is picked up next pass
+            for line in chunk.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if line.strip():
+                    yield b"id: %d\ndata: %s\n\n" % (offset, line.rstrip())
+        else:
+            # Carry the offset so a reconnect resumes here even when nothing was logged
+            yield b"id: %d\n: keepalive\n\n" % offset
+
+        time.sleep(EVENTS_POLL_INTERVAL)
 
 # Initialize dashboard
 dashboard = AgentDashboard()
 
+def _json_response(obj: Any) -> Response:
+    """JSON response with a content ETag; answers If-None-Match with 304"""
+    payload = _dumps(obj)
+    response = Response(
+        payload,
+        mimetype="application/json",
+        headers={"Cache-Control": f"max-age={int(CACHE_TTL)}"}
+    )
+    response.set_etag(hashlib.blake2b(payload, digest_size=8).hexdigest())
+    return response.make_conditional(request)
+
 @app.route("/")
 def index():
     """Main dashboard page"""
@@ -149,8 +332,11 @@ def index():
 
 @app.route("/api/status")
 def api_status():
-    """API endpoint for agent status"""
-    return jsonify({
+    """API endpoint for agent status (?force=1 bypasses the cache)"""
+    if request.args.get("force") == "1":
+        dashboard.invalidate()
+
+    return _json_response({
         "agents": dashboard.get_agent_status(),
         "system_health": dashboard.get_system_health()
     })
@@ -158,32 +344,62 @@ def api_status():
 @app.route("/api/metrics")
 def api_metrics():
     """API endpoint for metrics"""
-    return jsonify({
+    return _json_response({
         "summary": dashboard.get_summary_metrics(),
         "recent": dashboard.get_recent_metrics(100)
     })
 
+@app.route("/api/events")
+def api_events():
+    """Server-sent event stream of newly logged metrics"""
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("offset")
+    if last_id is not None and last_id.isdigit():
+        offset = int(last_id)
+    else:
+        metrics_file = LOGS_DIR / "metrics.jsonl"
+        offset = metrics_file.stat().st_size if metrics_file.exists() else 0
+
+    return Response(
+        stream_with_context(_metric_events(offset)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.route("/api/reports")
 def api_reports():
     """API endpoint for reports"""
-    return jsonify({
+    return _json_response({
         "reports": dashboard.get_recent_reports()
     })
 
+def _gunzip_chunks(report_file: Path, chunk_size: int = TAIL_CHUNK):
+    """Yield decompressed report text for clients that don't accept gzip"""
+    with gzip.open(report_file, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
 @app.route("/api/report/<report_name>")
 def api_report_content(report_name):
     """Get specific report content"""
     report_file = REPORTS_DIR / report_name
 
-    if report_file.exists():
-        with open(report_file, 'r') as f:
-            return jsonify({
-                "name": report_name,
-                "content": f.read()
-            })
-    else:
+    if not report_file.is_file():
         return jsonify({"error": "Report not found"}), 404
 
+    if report_name.endswith(".gz"):
+        if "gzip" in request.accept_encodings:
+            # Pass the stored gzip bytes straight through
+            response = send_file(report_file, mimetype="text/plain", conditional=True)
+            response.headers["Content-Encoding"] = "gzip"
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        return Response(stream_with_context(_gunzip_chunks(report_file)), mimetype="text/plain")
+
+    return send_file(report_file, mimetype="text/plain", conditional=True)
+
 if __name__ == "__main__":
     print("🎯 AI Agent Dashboard Starting...")
     print("📊 Access dashboard at: http://localhost:11050")
@@ -193,4 +409,5 @@ if __name__ == "__main__":
     templates_dir = Path(__file__).parent / "templates"
     templates_dir.mkdir(exist_ok=True)
 
-    app.run(host="0.0.0.0", port=11050, debug=True)
+    # Development server only - production runs under gunicorn (see wsgi.py)
+    app.run(host="0.0.0.0", port=11050, debug=bool(os.environ.get("DEV")), threaded=True)
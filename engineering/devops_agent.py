@@ -5,19 +5,22 @@ Monitors platform health, automates deployments, manages infrastructure
 """
 import os
 import sys
-import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, day_stamp, run_async
 
 class DevOpsAgent(BaseAgent):
     """AI agent for DevOps and infrastructure management"""
 
+    __slots__ = ("infrastructure",)
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="DevOps Agent",
@@ -32,28 +35,27 @@ class DevOpsAgent(BaseAgent):
             "monitoring_tools": ["prometheus", "grafana", "neo4j"]
         }
 
-        self.logger.info(f"🔧 Monitoring {len(self.infrastructure['services'])} services across {len(self.infrastructure['environments'])} environments")
+        self.logger.info("🔧 Monitoring %d services across %d environments",
+                         len(self.infrastructure['services']), len(self.infrastructure['environments']))
 
     async def daily_infrastructure_check(self) -> Dict[str, Any]:
         """Execute daily infrastructure health check"""
         self.logger.info("🏗️ Starting daily infrastructure check")
 
         try:
-            # Step 1: Check service health
-            service_health = await self.check_service_health()
-
-            # Step 2: Monitor resource usage
-            resource_usage = await self.monitor_resources()
-
-            # Step 3: Check deployment pipeline
-            pipeline_status = await self.check_deployment_pipeline()
-
-            # Step 4: Security scan
-            security_scan = await self.run_security_scan()
+            # Steps 1-4 are independent: service health, resource usage,
+            # deployment pipeline and security scan run concurrently
+            service_health, resource_usage, pipeline_status, security_scan = await self.gather_steps(
+                self.check_service_health(),
+                self.monitor_resources(),
+                self.check_deployment_pipeline(),
+                self.run_security_scan()
+            )
 
             # Compile results
+            now = datetime.now()
             infra_report = {
-                "date": datetime.now().isoformat(),
+                "date": now.isoformat(),
                 "service_health": service_health,
                 "resource_usage": resource_usage,
                 "pipeline_status": pipeline_status,
@@ -62,14 +64,14 @@ class DevOpsAgent(BaseAgent):
             }
 
             # Save context
-            self.save_context(
-                f"infra_report_{datetime.now().strftime('%Y%m%d')}",
+            await self.asave_context(
+                f"infra_report_{day_stamp(now)}",
                 infra_report
             )
 
             healthy_services = sum(1 for s in service_health if s["status"] == "healthy")
-            self.logger.info(f"✅ Infrastructure check complete - {healthy_services}/{len(service_health)} services healthy")
-            self.log_metric("healthy_services", healthy_services)
+            self.logger.info("✅ Infrastructure check complete - %d/%d services healthy", healthy_services, len(service_health))
+            await self.alog_metric("healthy_services", healthy_services)
 
             return {
                 "success": True,
@@ -77,7 +79,7 @@ class DevOpsAgent(BaseAgent):
             }
 
         except Exception as e:
-            self.logger.error(f"❌ Infrastructure check failed: {str(e)}")
+            self.logger.error("❌ Infrastructure check failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -96,22 +98,22 @@ class DevOpsAgent(BaseAgent):
         return services
 
     async def monitor_resources(self) -> Dict[str, Any]:
-        """Monitor CPU, memory, disk usage"""
+        """Monitor CPU, memory, disk usage (percentages as ints)"""
         return {
             "cpu_usage": {
-                "current": "45%",
-                "peak_24h": "78%",
-                "avg_24h": "52%"
+                "current_pct": 45,
+                "peak_24h_pct": 78,
+                "avg_24h_pct": 52
             },
             "memory_usage": {
-                "current": "62%",
+                "current_pct": 62,
                 "available": "48GB",
-                "swap_usage": "5%"
+                "swap_usage_pct": 5
             },
             "disk_usage": {
-                "root": "45%",
-                "data": "67%",
-                "backups": "82%"
+                "root_pct": 45,
+                "data_pct": 67,
+                "backups_pct": 82
             },
             "network": {
                 "bandwidth_in": "125 Mbps",
@@ -163,11 +165,12 @@ class DevOpsAgent(BaseAgent):
                 alerts.append(f"🚨 {service['name']} is {service['status']}")
 
         # Check resource usage
-        disk_root = int(resource_usage.get("disk_usage", {}).get("root", "0%").replace("%", ""))
+        disk_usage = resource_usage.get("disk_usage", {})
+        disk_root = disk_usage.get("root_pct", 0)
         if disk_root > 80:
             alerts.append(f"⚠️  Root disk usage high: {disk_root}%")
 
-        disk_backups = int(resource_usage.get("disk_usage", {}).get("backups", "0%").replace("%", ""))
+        disk_backups = disk_usage.get("backups_pct", 0)
         if disk_backups > 85:
             alerts.append(f"🚨 Backup disk critical: {disk_backups}%")
 
@@ -180,8 +183,11 @@ class DevOpsAgent(BaseAgent):
 async def main():
     """Test DevOps agent"""
     agent = DevOpsAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -5,19 +5,22 @@ Runs automated tests, monitors quality metrics, identifies regressions
 """
 import os
 import sys
-import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, day_stamp, run_async
 
 class QATestingAgent(BaseAgent):
     """AI agent for QA and automated testing"""
 
+    __slots__ = ("test_suites",)
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="QA/Testing Agent",
@@ -31,28 +34,29 @@ class QATestingAgent(BaseAgent):
             "performance_tests", "security_tests", "regression_tests"
         ]
 
-        self.logger.info(f"🧪 Managing {len(self.test_suites)} test suites")
+        self.logger.info("🧪 Managing %d test suites", len(self.test_suites))
 
     async def daily_test_execution(self) -> Dict[str, Any]:
         """Execute daily automated test suite"""
         self.logger.info("🧪 Starting daily test execution")
 
         try:
-            # Step 1: Run all test suites
-            test_results = await self.run_test_suites()
-
-            # Step 2: Analyze test coverage
-            coverage_report = await self.analyze_test_coverage()
-
-            # Step 3: Identify regressions
-            regressions = await self.detect_regressions()
+            # Steps 1-3 are independent: test suites, coverage and regressions
+            # run concurrently
+            test_results, coverage_report, regressions = await self.gather_steps(
+                self.run_test_suites(),
+                self.analyze_test_coverage(),
+                self.detect_regressions()
+            )
 
-            # Step 4: Generate quality report
-            quality_metrics = await self.calculate_quality_metrics(test_results)
+            # Step 4: Generate quality report (depends on test results)
+            total_tests, passed_tests, failed_tests = self.tally_test_results(test_results)
+            quality_metrics = await self.calculate_quality_metrics(total_tests, passed_tests, failed_tests)
 
             # Compile results
+            now = datetime.now()
             qa_report = {
-                "date": datetime.now().isoformat(),
+                "date": now.isoformat(),
                 "test_results": test_results,
                 "coverage_report": coverage_report,
                 "regressions": regressions,
@@ -61,17 +65,13 @@ class QATestingAgent(BaseAgent):
             }
 
             # Save context
-            self.save_context(
-                f"qa_report_{datetime.now().strftime('%Y%m%d')}",
+            await self.asave_context(
+                f"qa_report_{day_stamp(now)}",
                 qa_report
             )
 
-            passed_tests = sum(r["passed"] for r in test_results)
-            total_tests = sum(r["total"] for r in test_results)
-
-            self.logger.info(f"✅ Test execution complete - {passed_tests}/{total_tests} tests passed")
-            self.log_metric("tests_passed", passed_tests)
-            self.log_metric("tests_failed", total_tests - passed_tests)
+            self.logger.info("✅ Test execution complete - %d/%d tests passed", passed_tests, total_tests)
+            await self.alog_metrics(tests_passed=passed_tests, tests_failed=total_tests - passed_tests)
 
             return {
                 "success": True,
@@ -79,7 +79,7 @@ class QATestingAgent(BaseAgent):
             }
 
         except Exception as e:
-            self.logger.error(f"❌ Test execution failed: {str(e)}")
+            self.logger.error("❌ Test execution failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -171,12 +171,18 @@ class QATestingAgent(BaseAgent):
 
         return regressions
 
-    async def calculate_quality_metrics(self, test_results: List) -> Dict[str, Any]:
-        """Calculate overall quality metrics"""
-        total_tests = sum(r["total"] for r in test_results)
-        passed_tests = sum(r["passed"] for r in test_results)
-        failed_tests = sum(r["failed"] for r in test_results)
+    def tally_test_results(self, test_results: List) -> Tuple[int, int, int]:
+        """Sum total, passed and failed tests across suites in one pass"""
+        total_tests = passed_tests = failed_tests = 0
+        for r in test_results:
+            total_tests += r["total"]
+            passed_tests += r["passed"]
+            failed_tests += r["failed"]
 
+        return total_tests, passed_tests, failed_tests
+
+    async def calculate_quality_metrics(self, total_tests: int, passed_tests: int, failed_tests: int) -> Dict[str, Any]:
+        """Calculate overall quality metrics"""
         return {
             "total_tests": total_tests,
             "passed_tests": passed_tests,
@@ -213,8 +219,11 @@ class QATestingAgent(BaseAgent):
 async def main():
     """Test QA agent"""
     agent = QATestingAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
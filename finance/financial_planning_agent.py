@@ -5,20 +5,93 @@ Monitors ARR, MRR, burn rate, generates investor reports
 """
 import os
 import sys
-import asyncio
 import json
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-import pandas as pd
+from typing import Dict, List, Mapping, Optional, Any
+import numpy as np
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, day_stamp, run_async
+
+# Key financial metrics from the master GTM plan - built once, read-only
+_MASTER_PROJECTIONS = MappingProxyType({
+    "verticals": MappingProxyType({
+        "healthcare": MappingProxyType({"y1": 40_500_000, "y2": 153_000_000, "y3": 265_500_000}),
+        "retail": MappingProxyType({"y1": 21_600_000, "y2": 80_100_000, "y3": 138_600_000}),
+        "restaurant": MappingProxyType({"y1": 4_200_000, "y2": 14_800_000, "y3": 32_500_000}),
+        "banking": MappingProxyType({"y1": 2_500_000, "y2": 7_500_000, "y3": 23_000_000}),
+        "education": MappingProxyType({"y1": 4_200_000, "y2": 8_400_000, "y3": 15_800_000}),
+        "manufacturing": MappingProxyType({"y1": 5_000_000, "y2": 10_000_000, "y3": 15_000_000}),
+        "msp": MappingProxyType({"y1": 1_600_000, "y2": 6_400_000, "y3": 12_800_000}),
+        "hospitality": MappingProxyType({"y1": 3_500_000, "y2": 6_800_000, "y3": 10_000_000}),
+        "franchise": MappingProxyType({"y1": 2_500_000, "y2": 5_000_000, "y3": 9_400_000}),
+        "dns_saas": MappingProxyType({"y1": 100_000, "y2": 600_000, "y3": 1_800_000})
+    }),
+    "total": MappingProxyType({
+        "y1": 85_700_000,
+        "y2": 292_600_000,
+        "y3": 524_400_000
+    })
+})
+
+# Share of the Year 1 ARR target expected by month (others use month / 12)
+_EXPECTED_ARR_RATIOS = MappingProxyType({
+    1: 0.05,
+    2: 0.08,
+    3: 0.12,
+    6: 0.30,
+    9: 0.55,
+    12: 1.0
+})
+
+# (predicate, message) rules - message may be a callable taking the metrics
+_ALERT_RULES = (
+    # Runway alert
+    (lambda m: m["runway_months"] < 6,
+     lambda m: f"🚨 CRITICAL: Only {m['runway_months']:.1f} months runway remaining"),
+    # Variance alert
+    (lambda m: m["variance_percent"] < -20,
+     lambda m: f"⚠️  WARNING: {m['variance_percent']:.1f}% below target"),
+    # Burn rate alert
+    (lambda m: m["burn_rate"] > 3_500_000,
+     lambda m: f"⚠️  High burn rate: ${m['burn_rate']:,.0f}/month"),
+)
+
+_RECOMMENDATION_RULES = (
+    (lambda m: m["variance_percent"] < -10, "📈 Accelerate sales hiring to close gap to target"),
+    (lambda m: m["variance_percent"] < -10, "🎯 Focus on high-ARR verticals (Healthcare, Retail)"),
+    (lambda m: m["runway_months"] < 12, "💰 Begin Series B fundraising process"),
+    (lambda m: m.get("arpc", 0) < 400_000, "💎 Focus on enterprise customers to increase ARPC"),
+)
+
+def _apply_rules(rules: tuple, metrics: Dict) -> List[str]:
+    """Messages for every rule whose predicate matches the metrics"""
+    return [msg(metrics) if callable(msg) else msg for pred, msg in rules if pred(metrics)]
+
+# Vertical targets as parallel arrays for vectorized analysis
+_VERTICAL_NAMES = tuple(_MASTER_PROJECTIONS["verticals"])
+_VERTICAL_Y1 = np.array([t["y1"] for t in _MASTER_PROJECTIONS["verticals"].values()], dtype=np.int64)
+_VERTICAL_Y2 = np.array([t["y2"] for t in _MASTER_PROJECTIONS["verticals"].values()], dtype=np.int64)
+_VERTICAL_Y3 = np.array([t["y3"] for t in _MASTER_PROJECTIONS["verticals"].values()], dtype=np.int64)
 
 class FinancialPlanningAgent(BaseAgent):
     """AI agent for financial planning and reporting"""
 
+    __slots__ = ("master_plan", "vertical_names", "vertical_y1", "vertical_y2", "vertical_y3")
+
+    # GTM plans location
+    gtm_plans_dir = Path("/home/keith/chat-copilot/go-to-market-plans")
+
+    # Financial targets
+    year_1_arr_target = 85_700_000  # $85.7M from master plan
+    year_2_arr_target = 292_600_000  # $292.6M
+    year_3_arr_target = 524_400_000  # $524.4M
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Financial Planning Agent",
@@ -27,17 +100,19 @@ class FinancialPlanningAgent(BaseAgent):
         )
 
         # Load GTM financial projections
-        self.gtm_plans_dir = Path("/home/keith/chat-copilot/go-to-market-plans")
         self.master_plan = self.load_master_projections()
 
-        # Financial targets
-        self.year_1_arr_target = 85_700_000  # $85.7M from master plan
-        self.year_2_arr_target = 292_600_000  # $292.6M
-        self.year_3_arr_target = 524_400_000  # $524.4M
+        if self.master_plan:
+            self.vertical_names = _VERTICAL_NAMES
+            self.vertical_y1, self.vertical_y2, self.vertical_y3 = _VERTICAL_Y1, _VERTICAL_Y2, _VERTICAL_Y3
+        else:
+            # No plan on disk - analyze an empty vertical set
+            self.vertical_names = ()
+            self.vertical_y1 = self.vertical_y2 = self.vertical_y3 = np.empty(0, dtype=np.int64)
 
         self.logger.info(f"💰 Financial targets loaded - Year 1: ${self.year_1_arr_target:,.0f}")
 
-    def load_master_projections(self) -> Dict:
+    def load_master_projections(self) -> Mapping[str, Any]:
         """Load financial projections from master GTM plan"""
         master_file = self.gtm_plans_dir / "MASTER-EXECUTIVE-SUMMARY.md"
 
@@ -45,45 +120,30 @@ class FinancialPlanningAgent(BaseAgent):
             self.logger.warning("Master GTM plan not found")
             return {}
 
-        # Parse key financial metrics
-        projections = {
-            "verticals": {
-                "healthcare": {"y1": 40_500_000, "y2": 153_000_000, "y3": 265_500_000},
-                "retail": {"y1": 21_600_000, "y2": 80_100_000, "y3": 138_600_000},
-                "restaurant": {"y1": 4_200_000, "y2": 14_800_000, "y3": 32_500_000},
-                "banking": {"y1": 2_500_000, "y2": 7_500_000, "y3": 23_000_000},
-                "education": {"y1": 4_200_000, "y2": 8_400_000, "y3": 15_800_000},
-                "manufacturing": {"y1": 5_000_000, "y2": 10_000_000, "y3": 15_000_000},
-                "msp": {"y1": 1_600_000, "y2": 6_400_000, "y3": 12_800_000},
-                "hospitality": {"y1": 3_500_000, "y2": 6_800_000, "y3": 10_000_000},
-                "franchise": {"y1": 2_500_000, "y2": 5_000_000, "y3": 9_400_000},
-                "dns_saas": {"y1": 100_000, "y2": 600_000, "y3": 1_800_000}
-            },
-            "total": {
-                "y1": 85_700_000,
-                "y2": 292_600_000,
-                "y3": 524_400_000
-            }
-        }
-
-        return projections
+        return _MASTER_PROJECTIONS
 
     async def weekly_financial_update(self) -> Dict[str, Any]:
         """Generate weekly financial dashboard"""
         self.logger.info("📊 Generating weekly financial update")
 
         try:
-            # Calculate current metrics
-            current_arr = await self.calculate_current_arr()
+            # Calculate current metrics - each input computed once
+            current_arr = self._compute_arr()
             current_mrr = current_arr / 12
-            customers = await self.get_customer_count()
-
-            # Calculate variance from plan
-            variance = await self.calculate_variance(current_arr)
+            customers = self._compute_customers(current_arr)
+            burn_rate = self._compute_burn_rate()
+            cash_balance = self._compute_cash_balance(burn_rate)
+
+            # Variance from plan and vertical breakdown are independent
+            variance, vertical_performance = await self.gather_steps(
+                self.calculate_variance(current_arr),
+                self.analyze_vertical_performance()
+            )
 
             # Generate key metrics
+            now = datetime.now()
             metrics = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "current_arr": current_arr,
                 "current_mrr": current_mrr,
                 "target_arr_y1": self.year_1_arr_target,
@@ -91,24 +151,22 @@ class FinancialPlanningAgent(BaseAgent):
                 "variance_percent": ((current_arr / self.year_1_arr_target) - 1) * 100 if self.year_1_arr_target > 0 else 0,
                 "customers": customers,
                 "arpc": current_arr / customers if customers > 0 else 0,  # Average Revenue Per Customer
-                "burn_rate": await self.calculate_burn_rate(),
-                "runway_months": await self.calculate_runway(),
-                "cash_balance": await self.get_cash_balance()
+                "burn_rate": burn_rate,
+                "runway_months": self._compute_runway(cash_balance, burn_rate),
+                "cash_balance": cash_balance
             }
 
             # Vertical breakdown
-            vertical_performance = await self.analyze_vertical_performance()
             metrics["vertical_breakdown"] = vertical_performance
 
             # Save context
             self.save_context(
-                f"financial_update_{datetime.now().strftime('%Y%m%d')}",
+                f"financial_update_{day_stamp(now)}",
                 metrics
             )
 
             # Log metrics
-            self.log_metric("weekly_arr", current_arr)
-            self.log_metric("weekly_customers", customers)
+            self.log_metrics(weekly_arr=current_arr, weekly_customers=customers)
 
             self.logger.info(f"✅ Financial update complete - ARR: ${current_arr:,.0f}")
 
@@ -128,6 +186,27 @@ class FinancialPlanningAgent(BaseAgent):
 
     async def calculate_current_arr(self) -> float:
         """Calculate current Annual Recurring Revenue"""
+        return self._compute_arr()
+
+    async def get_customer_count(self) -> int:
+        """Get current customer count"""
+        return self._compute_customers(self._compute_arr())
+
+    async def calculate_burn_rate(self) -> float:
+        """Calculate monthly burn rate"""
+        return self._compute_burn_rate()
+
+    async def calculate_runway(self) -> float:
+        """Calculate runway in months"""
+        burn_rate = self._compute_burn_rate()
+        return self._compute_runway(self._compute_cash_balance(burn_rate), burn_rate)
+
+    async def get_cash_balance(self) -> float:
+        """Get current cash balance"""
+        return self._compute_cash_balance(self._compute_burn_rate())
+
+    def _compute_arr(self) -> float:
+        """Current ARR from cache or simulation"""
         # In production, query from billing system/CRM
         # For now, simulate based on phase
 
@@ -146,20 +225,17 @@ class FinancialPlanningAgent(BaseAgent):
 
         return current_arr
 
-    async def get_customer_count(self) -> int:
-        """Get current customer count"""
+    def _compute_customers(self, arr: float) -> int:
+        """Customer count implied by ARR"""
         # In production, query from CRM
-        # Simulate based on ARR
-        arr = await self.calculate_current_arr()
-
         # Assume average ACV of $500K (from GTM plan)
         avg_acv = 500_000
         customers = int(arr / avg_acv) if avg_acv > 0 else 0
 
         return max(3, customers)  # Minimum 3 customers (Arby's, BWW, Sonic)
 
-    async def calculate_burn_rate(self) -> float:
-        """Calculate monthly burn rate"""
+    def _compute_burn_rate(self) -> float:
+        """Monthly burn rate"""
         # In production, pull from accounting system
         # Simulate based on team size and infrastructure costs
 
@@ -168,45 +244,28 @@ class FinancialPlanningAgent(BaseAgent):
 
         return monthly_burn
 
-    async def calculate_runway(self) -> float:
-        """Calculate runway in months"""
-        cash_balance = await self.get_cash_balance()
-        burn_rate = await self.calculate_burn_rate()
-
-        if burn_rate > 0:
-            runway = cash_balance / burn_rate
-        else:
-            runway = float('inf')
-
-        return runway
-
-    async def get_cash_balance(self) -> float:
-        """Get current cash balance"""
+    def _compute_cash_balance(self, burn_rate: float) -> float:
+        """Cash balance after burn since funding"""
         # In production, pull from bank accounts
         # Simulate Series A funding: $45M raised, 3 months burn
-
         series_a = 45_000_000
         months_elapsed = 3
-        burn_rate = await self.calculate_burn_rate()
 
         cash_balance = series_a - (burn_rate * months_elapsed)
 
         return max(0, cash_balance)
 
+    def _compute_runway(self, cash_balance: float, burn_rate: float) -> float:
+        """Runway in months for a cash balance and burn rate"""
+        if burn_rate > 0:
+            return cash_balance / burn_rate
+        return float('inf')
+
     async def calculate_variance(self, current_arr: float) -> Dict[str, float]:
         """Calculate variance from GTM plan"""
         # Determine which quarter we're in
         month = 3  # Assume Month 3
-        expected_arr_by_month = {
-            1: self.year_1_arr_target * 0.05,
-            2: self.year_1_arr_target * 0.08,
-            3: self.year_1_arr_target * 0.12,
-            6: self.year_1_arr_target * 0.30,
-            9: self.year_1_arr_target * 0.55,
-            12: self.year_1_arr_target
-        }
-
-        expected_arr = expected_arr_by_month.get(month, self.year_1_arr_target * (month / 12))
+        expected_arr = self.year_1_arr_target * _EXPECTED_ARR_RATIOS.get(month, month / 12)
 
         return {
             "expected_arr": expected_arr,
@@ -220,54 +279,33 @@ class FinancialPlanningAgent(BaseAgent):
         # In production, query from CRM with vertical tagging
         # Simulate based on master projections
 
-        verticals = {}
-        for vertical, targets in self.master_plan.get("verticals", {}).items():
-            # Simulate current performance (Month 3)
-            current = targets["y1"] * 0.10  # 10% of Year 1 target
-
-            verticals[vertical] = {
-                "current_arr": current,
-                "target_y1": targets["y1"],
-                "target_y2": targets["y2"],
-                "target_y3": targets["y3"],
-                "progress_percent": (current / targets["y1"]) * 100 if targets["y1"] > 0 else 0
-            }
+        y1 = self.vertical_y1
 
-        return verticals
+        # Simulate current performance (Month 3) - 10% of Year 1 target
+        current = y1 * 0.10
+        progress = np.divide(current * 100, y1, out=np.zeros_like(current), where=y1 > 0)
+
+        return {
+            vertical: {
+                "current_arr": cur,
+                "target_y1": t1,
+                "target_y2": t2,
+                "target_y3": t3,
+                "progress_percent": pct
+            }
+            for vertical, cur, t1, t2, t3, pct in zip(
+                self.vertical_names, current.tolist(), y1.tolist(),
+                self.vertical_y2.tolist(), self.vertical_y3.tolist(), progress.tolist()
+            )
+        }
 
     async def generate_financial_alerts(self, metrics: Dict) -> List[str]:
         """Generate financial alerts and warnings"""
-        alerts = []
-
-        # Runway alert
-        if metrics["runway_months"] < 6:
-            alerts.append(f"🚨 CRITICAL: Only {metrics['runway_months']:.1f} months runway remaining")
-
-        # Variance alert
-        if metrics["variance_percent"] < -20:
-            alerts.append(f"⚠️  WARNING: {metrics['variance_percent']:.1f}% below target")
-
-        # Burn rate alert
-        if metrics["burn_rate"] > 3_500_000:
-            alerts.append(f"⚠️  High burn rate: ${metrics['burn_rate']:,.0f}/month")
-
-        return alerts
+        return _apply_rules(_ALERT_RULES, metrics)
 
     async def generate_recommendations(self, metrics: Dict) -> List[str]:
         """Generate strategic recommendations"""
-        recommendations = []
-
-        if metrics["variance_percent"] < -10:
-            recommendations.append("📈 Accelerate sales hiring to close gap to target")
-            recommendations.append("🎯 Focus on high-ARR verticals (Healthcare, Retail)")
-
-        if metrics["runway_months"] < 12:
-            recommendations.append("💰 Begin Series B fundraising process")
-
-        if metrics.get("arpc", 0) < 400_000:
-            recommendations.append("💎 Focus on enterprise customers to increase ARPC")
-
-        return recommendations
+        return _apply_rules(_RECOMMENDATION_RULES, metrics)
 
     async def run(self) -> Dict[str, Any]:
         """Main execution - called by orchestrator"""
@@ -276,8 +314,11 @@ class FinancialPlanningAgent(BaseAgent):
 async def main():
     """Test financial planning agent"""
     agent = FinancialPlanningAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Numeric Kernels - Shared hot loops for agent scoring and statistics
+Compiled with Numba when it is installed, NumPy/Python fallback otherwise
+"""
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+def _health_scores_loop(factors: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted score per row of a (customers x factors) matrix"""
+    n, k = factors.shape
+    out = np.empty(n)
+    for i in range(n):
+        acc = 0.0
+        for j in range(k):
+            acc += factors[i, j] * weights[j]
+        out[i] = acc
+    return out
+
+def _welford_loop(values: np.ndarray) -> Tuple[float, float]:
+    """Single-pass (Welford) mean and population variance"""
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for x in values:
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+    if count == 0:
+        return 0.0, 0.0
+    return float(mean), float(m2 / count)
+
+# Operational alert flags returned by ops_alert_flags
+ALERT_BLOCKED_WORK = 1
+ALERT_CHURN = 2
+ALERT_INCIDENTS = 4
+
+def _ops_alert_flags(blocked: int, churn: float, incidents: int) -> int:
+    """Bitmask of ALERT_* flags for blocked work, churn and incident thresholds"""
+    flags = 0
+    if blocked > 5:
+        flags |= ALERT_BLOCKED_WORK
+    if churn > 2.0:
+        flags |= ALERT_CHURN
+    if incidents > 10:
+        flags |= ALERT_INCIDENTS
+    return flags
+
+def _priority_rice_totals(priority_codes: np.ndarray, rice_scores: np.ndarray) -> Tuple[int, int, float]:
+    """P0 count, P1 count and RICE total for a backlog (priority code 0 == P0, 1 == P1)"""
+    p0 = 0
+    p1 = 0
+    total = 0.0
+    for i in range(priority_codes.shape[0]):
+        code = priority_codes[i]
+        if code == 0:
+            p0 += 1
+        elif code == 1:
+            p1 += 1
+        total += rice_scores[i]
+    return p0, p1, total
+
+def _lead_scores(priority_flags: np.ndarray, adjustments: np.ndarray) -> np.ndarray:
+    """Lead qualification scores clipped to 0-100 (base 50, +20 for priority verticals)"""
+    n = priority_flags.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        score = 50.0 + 20.0 * priority_flags[i] + adjustments[i]
+        out[i] = min(100.0, max(0.0, score))
+    return out
+
+if njit is not None:
+    health_scores = njit(cache=True)(_health_scores_loop)
+    variance_welford = njit(cache=True)(_welford_loop)
+    ops_alert_flags = njit(cache=True)(_ops_alert_flags)
+    priority_rice_totals = njit(cache=True)(_priority_rice_totals)
+    lead_scores = njit(cache=True)(_lead_scores)
+else:
+    def health_scores(factors: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Weighted score per row of a (customers x factors) matrix"""
+        return np.asarray(factors, dtype=np.float64) @ np.asarray(weights, dtype=np.float64)
+
+    variance_welford = _welford_loop
+    ops_alert_flags = _ops_alert_flags
+
+    def priority_rice_totals(priority_codes: np.ndarray, rice_scores: np.ndarray) -> Tuple[int, int, float]:
+        """P0 count, P1 count and RICE total for a backlog (priority code 0 == P0, 1 == P1)"""
+        return (int(np.count_nonzero(priority_codes == 0)),
+                int(np.count_nonzero(priority_codes == 1)),
+                float(rice_scores.sum()))
+
+    def lead_scores(priority_flags: np.ndarray, adjustments: np.ndarray) -> np.ndarray:
+        """Lead qualification scores clipped to 0-100 (base 50, +20 for priority verticals)"""
+        return np.clip(50.0 + 20.0 * priority_flags + adjustments, 0.0, 100.0)
@@ -5,19 +5,59 @@ Generates blog posts, social media content, SEO optimization
 """
 import os
 import sys
-import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Any
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, day_stamp, run_async
+
+# Shared, read-only social post literals
+_PLATFORMS = ("linkedin", "twitter", "facebook")
+_POST_TYPES = ("case_study", "tip", "news", "customer_success")
+_HASHTAGS = ("#AI", "#NetworkManagement", "#Enterprise")
+
+# Display forms and post body template, computed once
+_TITLED_PLATFORMS = {p: p.title() for p in _PLATFORMS}
+_TITLED_POST_TYPES = {pt: pt.replace("_", " ").title() for pt in _POST_TYPES}
+_SOCIAL_CONTENT_TMPL = "[AI Network Management {post_type}] - {platform} post content here"
+
+class SocialPost(NamedTuple):
+    """Lightweight social post record, converted to a dict when returned"""
+    platform: str
+    post_type: str
+    content: str
+    hashtags: tuple
+    scheduled_time: str
+    status: str
 
 class ContentMarketingAgent(BaseAgent):
     """AI agent for marketing content creation and SEO"""
 
+    __slots__ = ()
+
+    # Content types and targets
+    content_types = (
+        "blog_posts", "social_media", "case_studies",
+        "whitepapers", "email_campaigns", "seo_content"
+    )
+
+    # All 10 verticals from GTM plan
+    target_verticals = (
+        "healthcare", "retail-chains", "restaurant-chains",
+        "banking-financial", "education-government", "manufacturing",
+        "msp-platform", "hospitality-hotels", "franchise-operations",
+        "dns-certificate-saas"
+    )
+
+    # Content calendar
+    weekly_blog_target = 3
+    daily_social_posts = 5
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Content Marketing Agent",
@@ -25,24 +65,6 @@ class ContentMarketingAgent(BaseAgent):
             config=config or {}
         )
 
-        # Content types and targets
-        self.content_types = [
-            "blog_posts", "social_media", "case_studies",
-            "whitepapers", "email_campaigns", "seo_content"
-        ]
-
-        # All 10 verticals from GTM plan
-        self.target_verticals = [
-            "healthcare", "retail-chains", "restaurant-chains",
-            "banking-financial", "education-government", "manufacturing",
-            "msp-platform", "hospitality-hotels", "franchise-operations",
-            "dns-certificate-saas"
-        ]
-
-        # Content calendar
-        self.weekly_blog_target = 3
-        self.daily_social_posts = 5
-
         self.logger.info(f"📝 Targeting {len(self.content_types)} content types across {len(self.target_verticals)} verticals")
 
     async def weekly_content_generation(self) -> Dict[str, Any]:
@@ -50,21 +72,22 @@ class ContentMarketingAgent(BaseAgent):
         self.logger.info("📝 Starting weekly content generation")
 
         try:
-            # Step 1: Generate blog posts
-            blog_posts = await self.generate_blog_posts()
-
-            # Step 2: Create social media content
-            social_content = await self.generate_social_media()
-
-            # Step 3: SEO optimization
-            seo_updates = await self.optimize_seo()
-
-            # Step 4: Email campaigns
-            email_campaigns = await self.create_email_campaigns()
+            # One timestamp shared by every item generated this run
+            now = datetime.now()
+            now_iso = now.isoformat()
+
+            # Steps 1-4 are independent: blog posts, social media, SEO
+            # and email campaigns are generated concurrently
+            blog_posts, social_content, seo_updates, email_campaigns = await self.gather_steps(
+                self.generate_blog_posts(now_iso),
+                self.generate_social_media(now_iso),
+                self.optimize_seo(),
+                self.create_email_campaigns()
+            )
 
             # Compile results
             content_library = {
-                "date": datetime.now().isoformat(),
+                "date": now_iso,
                 "blog_posts": blog_posts,
                 "social_content": social_content,
                 "seo_updates": seo_updates,
@@ -74,13 +97,15 @@ class ContentMarketingAgent(BaseAgent):
 
             # Save context
             self.save_context(
-                f"content_library_{datetime.now().strftime('%Y%m%d')}",
+                f"content_library_{day_stamp(now)}",
                 content_library
             )
 
             self.logger.info(f"✅ Content generation complete - {len(blog_posts)} blogs, {len(social_content)} social posts")
-            self.log_metric("blog_posts_created", len(blog_posts))
-            self.log_metric("social_posts_created", len(social_content))
+            self.log_metrics(
+                blog_posts_created=len(blog_posts),
+                social_posts_created=len(social_content)
+            )
 
             return {
                 "success": True,
@@ -94,9 +119,10 @@ class ContentMarketingAgent(BaseAgent):
                 "error": str(e)
             }
 
-    async def generate_blog_posts(self) -> List[Dict]:
+    async def generate_blog_posts(self, now_iso: Optional[str] = None) -> List[Dict]:
         """Generate blog posts for target verticals"""
         blog_posts = []
+        created_date = now_iso or datetime.now().isoformat()
 
         topics = [
             {"vertical": "healthcare", "title": "5 Ways AI Reduces Network Downtime in Healthcare", "keywords": ["healthcare IT", "network management", "AI automation"]},
@@ -112,32 +138,34 @@ class ContentMarketingAgent(BaseAgent):
                 "status": "draft",
                 "word_count": 1500,
                 "seo_score": 85,
-                "created_date": datetime.now().isoformat()
+                "created_date": created_date
             })
 
         return blog_posts
 
-    async def generate_social_media(self) -> List[Dict]:
+    async def generate_social_media(self, now_iso: Optional[str] = None) -> List[Dict]:
         """Generate social media posts"""
-        social_posts = []
-
-        platforms = ["linkedin", "twitter", "facebook"]
-        post_types = ["case_study", "tip", "news", "customer_success"]
-
-        for i in range(self.daily_social_posts):
-            platform = platforms[i % len(platforms)]
-            post_type = post_types[i % len(post_types)]
-
-            social_posts.append({
-                "platform": platform,
-                "post_type": post_type,
-                "content": f"[AI Network Management {post_type.replace('_', ' ').title()}] - {platform.title()} post content here",
-                "hashtags": ["#AI", "#NetworkManagement", "#Enterprise"],
-                "scheduled_time": datetime.now().isoformat(),
-                "status": "scheduled"
-            })
+        scheduled_time = now_iso or datetime.now().isoformat()
+
+        posts = [
+            SocialPost(
+                platform,
+                post_type,
+                _SOCIAL_CONTENT_TMPL.format_map({
+                    "post_type": _TITLED_POST_TYPES[post_type],
+                    "platform": _TITLED_PLATFORMS[platform]
+                }),
+                _HASHTAGS,
+                scheduled_time,
+                "scheduled"
+            )
+            for platform, post_type in (
+                (_PLATFORMS[i % len(_PLATFORMS)], _POST_TYPES[i % len(_POST_TYPES)])
+                for i in range(self.daily_social_posts)
+            )
+        ]
 
-        return social_posts
+        return [post._asdict() for post in posts]
 
     async def optimize_seo(self) -> Dict[str, Any]:
         """Perform SEO optimization"""
@@ -182,7 +210,7 @@ class ContentMarketingAgent(BaseAgent):
             "total_content_pieces": len(blog_posts) + len(social_content),
             "blog_posts_this_week": len(blog_posts),
             "social_posts_scheduled": len(social_content),
-            "estimated_reach": sum([post.get("audience_size", 1000) for post in social_content]),
+            "estimated_reach": sum(post.get("audience_size", 1000) for post in social_content),
             "seo_health_score": 82,
             "content_calendar_completion": "85%"
         }
@@ -194,8 +222,11 @@ class ContentMarketingAgent(BaseAgent):
 async def main():
     """Test content marketing agent"""
     agent = ContentMarketingAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -5,19 +5,68 @@ Monitors customer health, identifies expansion opportunities, prevents churn
 """
 import os
 import sys
-import asyncio
 import json
+import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, freeze, day_stamp, run_async
+from kernels import health_scores as health_score_kernel, variance_welford
+
+# Multi-factor scoring model
+_DEFAULT_HEALTH_FACTORS = {
+    "platform_usage": 85.0,  # Active platform usage
+    "feature_adoption": 75.0,  # Using key features
+    "support_tickets": 90.0,  # Low support volume
+    "executive_engagement": 80.0,  # Regular QBRs
+    "payment_status": 100.0,  # On-time payments
+    "nps_score": 85.0  # Net Promoter Score
+}
+
+_HEALTH_WEIGHTS = {
+    "platform_usage": 0.25,
+    "feature_adoption": 0.20,
+    "support_tickets": 0.15,
+    "executive_engagement": 0.15,
+    "payment_status": 0.15,
+    "nps_score": 0.10
+}
+
+def _weighted_health_score(factors: Dict[str, float]) -> float:
+    """Weighted average of health factors, rounded to one decimal"""
+    return round(sum(factors[k] * _HEALTH_WEIGHTS[k] for k in _HEALTH_WEIGHTS), 1)
+
+# Change in average health (points) vs the previous day that counts as a trend
+HEALTH_TREND_THRESHOLD = 1.0
+
+# Weights as a vector in _HEALTH_WEIGHTS key order, for the batch kernel
+_HEALTH_WEIGHT_VECTOR = np.array(list(_HEALTH_WEIGHTS.values()), dtype=np.float64)
+
+# Factors are constant today, so the default score is computed once
+_DEFAULT_HEALTH_SCORE = _weighted_health_score(_DEFAULT_HEALTH_FACTORS)
 
 class CustomerSuccessAgent(BaseAgent):
     """AI agent for customer success and health monitoring"""
 
+    __slots__ = ()
+
+    # Known customers (from GTM plan - proven deployment)
+    customers = freeze([
+        {"name": "Arby's", "locations": 3400, "devices": 10200, "vertical": "restaurant"},
+        {"name": "Buffalo Wild Wings", "locations": 1200, "devices": 3600, "vertical": "restaurant"},
+        {"name": "Sonic", "locations": 3500, "devices": 10500, "vertical": "restaurant"}
+    ])
+
+    # Name lookup plus column arrays for vectorized checks
+    _customer_index = freeze({c["name"]: i for i, c in enumerate(customers)})
+    customer_locations = np.array([c["locations"] for c in customers], dtype=np.int64)
+    customer_devices = np.array([c["devices"] for c in customers], dtype=np.int64)
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Customer Success Agent",
@@ -25,13 +74,6 @@ class CustomerSuccessAgent(BaseAgent):
             config=config or {}
         )
 
-        # Known customers (from GTM plan - proven deployment)
-        self.customers = [
-            {"name": "Arby's", "locations": 3400, "devices": 10200, "vertical": "restaurant"},
-            {"name": "Buffalo Wild Wings", "locations": 1200, "devices": 3600, "vertical": "restaurant"},
-            {"name": "Sonic", "locations": 3500, "devices": 10500, "vertical": "restaurant"}
-        ]
-
         self.logger.info(f"👥 Monitoring {len(self.customers)} customers")
 
     async def daily_health_check(self) -> Dict[str, Any]:
@@ -52,8 +94,9 @@ class CustomerSuccessAgent(BaseAgent):
             outreach_plan = await self.generate_outreach_plan(at_risk, expansion_opps)
 
             # Compile report
+            now = datetime.now()
             report = {
-                "date": datetime.now().isoformat(),
+                "date": now.isoformat(),
                 "total_customers": len(self.customers),
                 "health_scores": health_scores,
                 "at_risk_customers": at_risk,
@@ -64,18 +107,20 @@ class CustomerSuccessAgent(BaseAgent):
 
             # Save context
             self.save_context(
-                f"health_check_{datetime.now().strftime('%Y%m%d')}",
+                f"health_check_{day_stamp(now)}",
                 report
             )
 
             self.logger.info(f"✅ Health check complete - {len(at_risk)} at-risk, {len(expansion_opps)} opportunities")
-            self.log_metric("at_risk_customers", len(at_risk))
-            self.log_metric("expansion_opportunities", len(expansion_opps))
+            self.log_metrics(
+                at_risk_customers=len(at_risk),
+                expansion_opportunities=len(expansion_opps)
+            )
 
             return {
                 "success": True,
                 "report": report,
-                "alerts": self.generate_health_alerts(report)
+                "alerts": self.generate_health_alerts(at_risk, expansion_opps)
             }
 
         except Exception as e:
@@ -89,9 +134,15 @@ class CustomerSuccessAgent(BaseAgent):
         """Calculate health score for each customer"""
         health_scores = []
 
-        for customer in self.customers:
-            # Calculate multi-factor health score (0-100)
-            score = await self.calculate_customer_health_score(customer)
+        # Multi-factor health scores (0-100) for all customers in one kernel call
+        factor_rows = np.array([
+            [customer.get("health_factors", _DEFAULT_HEALTH_FACTORS)[k] for k in _HEALTH_WEIGHTS]
+            for customer in self.customers
+        ], dtype=np.float64).reshape(len(self.customers), len(_HEALTH_WEIGHTS))
+        scores = health_score_kernel(factor_rows, _HEALTH_WEIGHT_VECTOR).tolist()
+
+        for customer, raw_score in zip(self.customers, scores):
+            score = round(raw_score, 1)
 
             health_scores.append({
                 "customer": customer["name"],
@@ -105,31 +156,11 @@ class CustomerSuccessAgent(BaseAgent):
 
         return health_scores
 
-    async def calculate_customer_health_score(self, customer: Dict) -> float:
+    async def calculate_customer_health_score(self, customer: Dict, factors: Optional[Dict[str, float]] = None) -> float:
         """Calculate individual customer health score"""
-        # Multi-factor scoring model
-        factors = {
-            "platform_usage": 85.0,  # Active platform usage
-            "feature_adoption": 75.0,  # Using key features
-            "support_tickets": 90.0,  # Low support volume
-            "executive_engagement": 80.0,  # Regular QBRs
-            "payment_status": 100.0,  # On-time payments
-            "nps_score": 85.0  # Net Promoter Score
-        }
-
-        # Weighted average
-        weights = {
-            "platform_usage": 0.25,
-            "feature_adoption": 0.20,
-            "support_tickets": 0.15,
-            "executive_engagement": 0.15,
-            "payment_status": 0.15,
-            "nps_score": 0.10
-        }
-
-        score = sum(factors[k] * weights[k] for k in factors.keys())
-
-        return round(score, 1)
+        if factors is None:
+            return _DEFAULT_HEALTH_SCORE
+        return _weighted_health_score(factors)
 
     def categorize_risk(self, score: float) -> str:
         """Categorize customer risk level"""
@@ -153,11 +184,13 @@ class CustomerSuccessAgent(BaseAgent):
     async def identify_expansion_opportunities(self, health_scores: List[Dict]) -> List[Dict]:
         """Identify expansion and upsell opportunities"""
         opportunities = []
+        expandable = (self.customer_locations < 5000).tolist()
 
         for customer_health in health_scores:
             if customer_health["health_score"] >= 80:  # Only healthy customers
                 # Check for expansion potential
-                customer = next(c for c in self.customers if c["name"] == customer_health["customer"])
+                idx = self._customer_index[customer_health["customer"]]
+                customer = self.customers[idx]
 
                 # Upsell to additional features
                 opportunities.append({
@@ -170,7 +203,7 @@ class CustomerSuccessAgent(BaseAgent):
                 })
 
                 # Expand to more locations
-                if customer["locations"] < 5000:
+                if expandable[idx]:
                     opportunities.append({
                         "customer": customer["name"],
                         "type": "location_expansion",
@@ -190,6 +223,11 @@ class CustomerSuccessAgent(BaseAgent):
             "routine_check_ins": []
         }
 
+        # Due dates are loop-invariant
+        now = datetime.now()
+        due_2d = (now + timedelta(days=2)).isoformat()
+        due_7d = (now + timedelta(days=7)).isoformat()
+
         # At-risk customer outreach
         for customer in at_risk:
             plan["at_risk_outreach"].append({
@@ -197,7 +235,7 @@ class CustomerSuccessAgent(BaseAgent):
                 "action": "Executive escalation call",
                 "urgency": "high",
                 "owner": "VP Customer Success",
-                "due_date": (datetime.now() + timedelta(days=2)).isoformat()
+                "due_date": due_2d
             })
 
         # Expansion opportunity outreach
@@ -208,7 +246,7 @@ class CustomerSuccessAgent(BaseAgent):
                 "opportunity": opp["opportunity"],
                 "urgency": "medium",
                 "owner": "Account Manager",
-                "due_date": (datetime.now() + timedelta(days=7)).isoformat()
+                "due_date": due_7d
             })
 
         return plan
@@ -218,30 +256,47 @@ class CustomerSuccessAgent(BaseAgent):
         if not health_scores:
             return {}
 
-        avg_score = sum(c["health_score"] for c in health_scores) / len(health_scores)
+        risk_counts = {"healthy": 0, "attention_needed": 0, "at_risk": 0}
+        for c in health_scores:
+            risk_counts[c["risk_level"]] += 1
 
-        risk_counts = {
-            "healthy": len([c for c in health_scores if c["risk_level"] == "healthy"]),
-            "attention_needed": len([c for c in health_scores if c["risk_level"] == "attention_needed"]),
-            "at_risk": len([c for c in health_scores if c["risk_level"] == "at_risk"])
-        }
+        # Numerically stable single-pass mean/variance
+        mean, variance = variance_welford(
+            np.array([c["health_score"] for c in health_scores], dtype=np.float64)
+        )
 
         return {
-            "average_health_score": round(avg_score, 1),
+            "average_health_score": round(mean, 1),
+            "health_score_stddev": round(variance ** 0.5, 2),
             "risk_distribution": risk_counts,
-            "health_trend": "improving"  # Would compare to historical data
+            "health_trend": self.calculate_health_trend(mean)
         }
 
-    def generate_health_alerts(self, report: Dict) -> List[str]:
+    def calculate_health_trend(self, average_score: float) -> str:
+        """Compare today's average health to the previous day's health check"""
+        yesterday = day_stamp(datetime.now() - timedelta(days=1))
+        previous = self.load_context(f"health_check_{yesterday}")
+        if not previous:
+            return "no_history"
+
+        previous_avg = previous.get("summary_metrics", {}).get("average_health_score")
+        if previous_avg is None:
+            return "no_history"
+
+        delta = average_score - previous_avg
+        if delta >= HEALTH_TREND_THRESHOLD:
+            return "improving"
+        if delta <= -HEALTH_TREND_THRESHOLD:
+            return "declining"
+        return "stable"
+
+    def generate_health_alerts(self, at_risk: List[Dict], expansion_opps: List[Dict]) -> List[str]:
         """Generate customer health alerts"""
-        alerts = []
-
-        at_risk = report.get("at_risk_customers", [])
-        if at_risk:
-            for customer in at_risk:
-                alerts.append(f"⚠️  {customer['customer']} health score: {customer['health_score']} - Immediate attention required")
+        alerts = [
+            f"⚠️  {customer['customer']} health score: {customer['health_score']} - Immediate attention required"
+            for customer in at_risk
+        ]
 
-        expansion_opps = report.get("expansion_opportunities", [])
         if len(expansion_opps) > 3:
             alerts.append(f"💰 {len(expansion_opps)} expansion opportunities identified")
 
@@ -254,8 +309,11 @@ class CustomerSuccessAgent(BaseAgent):
 async def main():
     """Test customer success agent"""
     agent = CustomerSuccessAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
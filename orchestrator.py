@@ -5,28 +5,27 @@ Runs daily/weekly/monthly workflows with intelligent scheduling
 """
 import os
 import sys
+import gzip
+import importlib
 import asyncio
 import json
-import schedule
-import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
 
-# Import all agents
-sys.path.insert(0, str(Path(__file__).parent))
+import aiohttp
+import jinja2
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
 
-from sales.lead_generation_agent import LeadGenerationAgent
-from finance.financial_planning_agent import FinancialPlanningAgent
-from research.market_intelligence_agent import MarketIntelligenceAgent
-from research.customer_intelligence_agent import CustomerIntelligenceAgent
-from operations.customer_success_agent import CustomerSuccessAgent
-from operations.operations_agent import OperationsAgent
-from marketing.content_marketing_agent import ContentMarketingAgent
-from product.product_manager_agent import ProductManagerAgent
-from engineering.devops_agent import DevOpsAgent
-from engineering.qa_testing_agent import QATestingAgent
+# Make agent packages importable
+_ROOT = str(Path(__file__).resolve().parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from base_agent import BaseAgent, new_http_session, run_async
 
 # Configure logging
 logging.basicConfig(
@@ -39,6 +38,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Orchestrator")
 
+# Agents run by the daily workflow, in report order
+DAILY_AGENTS = ("sales_dev", "market_intel", "customer_success", "devops", "qa_testing", "operations")
+
+# Max agents running at once (AGENT_CONCURRENCY overrides)
+AGENT_CONCURRENCY = int(os.getenv("AGENT_CONCURRENCY", "4"))
+
+# Agent key -> (module, class); modules are imported on first use
+_AGENT_FACTORIES = {
+    "sales_dev": ("sales.lead_generation_agent", "LeadGenerationAgent"),
+    "financial": ("finance.financial_planning_agent", "FinancialPlanningAgent"),
+    "market_intel": ("research.market_intelligence_agent", "MarketIntelligenceAgent"),
+    "customer_intel": ("research.customer_intelligence_agent", "CustomerIntelligenceAgent"),
+    "customer_success": ("operations.customer_success_agent", "CustomerSuccessAgent"),
+    "operations": ("operations.operations_agent", "OperationsAgent"),
+    "content_marketing": ("marketing.content_marketing_agent", "ContentMarketingAgent"),
+    "product_manager": ("product.product_manager_agent", "ProductManagerAgent"),
+    "devops": ("engineering.devops_agent", "DevOpsAgent"),
+    "qa_testing": ("engineering.qa_testing_agent", "QATestingAgent")
+}
+
+# Report layout constants
+_RULE = '=' * 70
+
+_DAILY_REPORT_TMPL = jinja2.Environment(
+    trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True
+).from_string("""
+{{ rule }}
+🤖 AI AGENT DAILY REPORT
+{{ rule }}
+Date: {{ now.strftime('%Y-%m-%d') }}
+Execution Time: {{ now.strftime('%H:%M:%S') }}
+
+📊 SALES DEVELOPMENT
+{% if sales.get('success') %}
+  ✅ Generated {{ sales.get('leads_generated', 0) }} qualified leads
+  🎯 Top verticals: Healthcare, Retail, Banking
+{% else %}
+  ❌ Failed: {{ sales.get('error', 'Unknown') }}
+{% endif %}
+
+🔍 MARKET INTELLIGENCE
+{% if intel.get('success') %}
+  ✅ Intelligence gathering complete
+  {% if intel.get('alerts') %}
+  🚨 {{ intel.get('alerts')|length }} priority alerts
+  {% endif %}
+{% else %}
+  ❌ Failed: {{ intel.get('error', 'Unknown') }}
+{% endif %}
+
+👥 CUSTOMER SUCCESS
+{% if customer_success.get('success') %}
+  ✅ Health check complete
+  ⚠️  {{ cs_report.get('at_risk_customers', [])|length }} at-risk customers
+  💰 {{ cs_report.get('expansion_opportunities', [])|length }} expansion opportunities
+{% else %}
+  ❌ Failed: {{ customer_success.get('error', 'Unknown') }}
+{% endif %}
+
+⚙️ OPERATIONS
+{% if ops.get('success') %}
+  ✅ Operations review complete
+  📉 Churn: {{ '%.1f'|format(revenue.get('churn_rate', 0)) }}%  NRR: {{ '%.0f'|format(revenue.get('nrr_pct', 0)) }}%
+  🟢 Uptime: {{ '%.2f'|format(operational.get('uptime_pct', 0)) }}%  MTTR: {{ '%.1f'|format(operational.get('mttr_hours', 0)) }}h
+{% else %}
+  ❌ Failed: {{ ops.get('error', 'Unknown') }}
+{% endif %}
+
+{{ rule }}
+""")
+
+_MONTHLY_REPORT_TMPL = f"""
+{_RULE}
+📈 AI AGENT MONTHLY EXECUTIVE BRIEFING
+{_RULE}
+Month: {{month}}
+
+MONTHLY PERFORMANCE REVIEW
+[Comprehensive analysis would be generated here]
+
+STRATEGIC RECOMMENDATIONS
+[AI-generated strategic recommendations would be included here]
+
+{_RULE}
+"""
+
+# Late runs (suspend, restarts) still fire within this window, collapsed into one
+SCHEDULER_MISFIRE_GRACE = 3600
+
+# Report filename per workflow kind, formatted with the run's start time
+_REPORT_FILENAMES = {
+    "daily": "daily_report_%Y%m%d.txt.gz",
+    "weekly": "weekly_report_%Y%m%d.txt.gz",
+    "monthly": "monthly_report_%Y%m.txt.gz"
+}
+
+@dataclass
+class WorkflowRun:
+    """State shared by the steps of one workflow execution"""
+    kind: str
+    started_at: datetime
+    filepath: Path
+    report: str = ""
+
+def _sync_write(path: Path, data: str):
+    """Write a gzip-compressed text file (runs in a worker thread)"""
+    with gzip.open(path, 'wt', compresslevel=6) as f:
+        f.write(data)
+
 class AgentOrchestrator:
     """Master orchestrator for all AI agents"""
 
@@ -48,97 +156,122 @@ class AgentOrchestrator:
         self.reports_dir = self.workspace / "reports"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize all agents
-        self.agents = {
-            "sales_dev": LeadGenerationAgent(),
-            "financial": FinancialPlanningAgent(),
-            "market_intel": MarketIntelligenceAgent(),
-            "customer_intel": CustomerIntelligenceAgent(),
-            "customer_success": CustomerSuccessAgent(),
-            "operations": OperationsAgent(),
-            "content_marketing": ContentMarketingAgent(),
-            "product_manager": ProductManagerAgent(),
-            "devops": DevOpsAgent(),
-            "qa_testing": QATestingAgent()
-        }
-
-        self.logger.info(f"🎯 Orchestrator initialized with {len(self.agents)} agents")
+        # Agents are built on first use - see _agent()
+        self._agents: Dict[str, BaseAgent] = {}
+
+        # One HTTP session for all agents, created on the event loop - see _ensure_http()
+        self.http: Optional[aiohttp.ClientSession] = None
+
+        # Caps how many agents run concurrently within a workflow
+        self._agent_sem = asyncio.Semaphore(AGENT_CONCURRENCY)
+
+        self.logger.info("🎯 Orchestrator initialized with %d agents", len(_AGENT_FACTORIES))
+
+    def _agent(self, key: str) -> BaseAgent:
+        """Return the agent for key, importing and constructing it on first use"""
+        agent = self._agents.get(key)
+        if agent is None:
+            module_name, class_name = _AGENT_FACTORIES[key]
+            agent_cls = getattr(importlib.import_module(module_name), class_name)
+            agent = self._agents[key] = agent_cls()
+            agent.http = self.http
+        return agent
+
+    async def _run_agent(self, key: str) -> Dict[str, Any]:
+        """Run one agent once a concurrency slot is free"""
+        async with self._agent_sem:
+            return await self._agent(key).run()
+
+    async def _ensure_http(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use and hand it to every agent"""
+        if self.http is None or self.http.closed:
+            self.http = new_http_session()
+            for agent in self._agents.values():
+                agent.http = self.http
+        return self.http
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
 
     async def daily_workflow(self):
         """Execute daily agent tasks in parallel"""
+        run = self._start_run("daily")
         self.logger.info("="*70)
-        self.logger.info(f"🌅 DAILY WORKFLOW STARTING - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.info("🌅 DAILY WORKFLOW STARTING - %s", run.started_at.replace(microsecond=0))
         self.logger.info("="*70)
 
+        await self._ensure_http()
+
         try:
-            # Run independent agents in parallel
-            tasks = [
-                self.agents["sales_dev"].run(),
-                self.agents["market_intel"].run(),
-                self.agents["customer_success"].run(),
-                self.agents["devops"].run(),
-                self.agents["qa_testing"].run(),
-                self.agents["operations"].run()
-            ]
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results
+            # Run independent agents in parallel, coalescing each agent's context saves
+            tasks = [self._run_agent(key) for key in DAILY_AGENTS]
+            with BaseAgent.batch_writes():
+                results = dict(zip(DAILY_AGENTS, await asyncio.gather(*tasks, return_exceptions=True)))
+            BaseAgent.flush_metrics()
+
+            # Process results - collect errors in the same pass that normalizes them
+            errors = []
+            for key, result in results.items():
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                results[key] = self._normalize_result(result)
+
             daily_summary = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": run.started_at.isoformat(),
                 "workflow": "daily",
                 "agents_executed": len(tasks),
-                "results": {
-                    "sales_dev": results[0] if len(results) > 0 else None,
-                    "market_intel": results[1] if len(results) > 1 else None,
-                    "customer_success": results[2] if len(results) > 2 else None,
-                    "devops": results[3] if len(results) > 3 else None,
-                    "qa_testing": results[4] if len(results) > 4 else None,
-                    "operations": results[5] if len(results) > 5 else None
-                },
-                "errors": [r for r in results if isinstance(r, Exception)]
+                "results": results,
+                "errors": errors
             }
 
             # Generate daily report
-            report = self.generate_daily_report(daily_summary)
+            run.report = self.generate_daily_report(daily_summary, run.started_at)
 
             # Save report
-            self.save_daily_report(report)
+            await self.save_report(run)
 
             # Send notifications
-            await self.send_notifications(report, "daily")
+            await self.send_notifications(run)
 
-            self.logger.info(f"✅ Daily workflow complete - {len(daily_summary['errors'])} errors")
+            self.logger.info("✅ Daily workflow complete - %d errors", len(errors))
 
             return daily_summary
 
         except Exception as e:
-            self.logger.error(f"❌ Daily workflow failed: {str(e)}")
+            self.logger.error("❌ Daily workflow failed: %s", e)
             raise
 
     async def weekly_workflow(self):
-        """Execute weekly agent tasks sequentially"""
+        """Execute weekly agent tasks in parallel"""
+        run = self._start_run("weekly")
         self.logger.info("="*70)
-        self.logger.info(f"📊 WEEKLY WORKFLOW STARTING - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.info("📊 WEEKLY WORKFLOW STARTING - %s", run.started_at.replace(microsecond=0))
         self.logger.info("="*70)
 
-        try:
-            # Run weekly agents sequentially
-            self.logger.info("💰 Running Financial Planning Agent")
-            financial_results = await self.agents["financial"].run()
-
-            self.logger.info("📝 Running Content Marketing Agent")
-            marketing_results = await self.agents["content_marketing"].run()
-
-            self.logger.info("🗺️ Running Product Manager Agent")
-            product_results = await self.agents["product_manager"].run()
+        await self._ensure_http()
 
-            self.logger.info("🔍 Running Customer Intelligence Agent")
-            intel_results = await self.agents["customer_intel"].run()
+        try:
+            # Run independent weekly agents in parallel, coalescing context saves
+            self.logger.info("🚀 Running weekly agents: financial, content marketing, product manager, customer intelligence")
+            with BaseAgent.batch_writes():
+                results = await asyncio.gather(
+                    self._run_agent("financial"),
+                    self._run_agent("content_marketing"),
+                    self._run_agent("product_manager"),
+                    self._run_agent("customer_intel"),
+                    return_exceptions=True
+                )
+            BaseAgent.flush_metrics()
+
+            financial_results, marketing_results, product_results, intel_results = (
+                self._normalize_result(r) for r in results
+            )
 
             # Generate weekly summary
             weekly_summary = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": run.started_at.isoformat(),
                 "workflow": "weekly",
                 "financial_update": financial_results,
                 "marketing_content": marketing_results,
@@ -148,170 +281,127 @@ class AgentOrchestrator:
             }
 
             # Generate weekly report
-            report = self.generate_weekly_report(weekly_summary)
+            run.report = self.generate_weekly_report(weekly_summary, run.started_at)
 
             # Save report
-            self.save_weekly_report(report)
+            await self.save_report(run)
 
             # Send executive update
-            await self.send_notifications(report, "weekly")
+            await self.send_notifications(run)
 
             self.logger.info("✅ Weekly workflow complete")
 
             return weekly_summary
 
         except Exception as e:
-            self.logger.error(f"❌ Weekly workflow failed: {str(e)}")
+            self.logger.error("❌ Weekly workflow failed: %s", e)
             raise
 
     async def monthly_workflow(self):
         """Execute monthly strategic review"""
+        run = self._start_run("monthly")
         self.logger.info("="*70)
-        self.logger.info(f"📈 MONTHLY WORKFLOW STARTING - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.info("📈 MONTHLY WORKFLOW STARTING - %s", run.started_at.replace(microsecond=0))
         self.logger.info("="*70)
 
+        await self._ensure_http()
+
         try:
             # Collect all monthly data
             monthly_summary = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": run.started_at.isoformat(),
                 "workflow": "monthly",
                 "performance_review": await self.generate_performance_review(),
                 "strategic_recommendations": await self.generate_strategic_recommendations()
             }
 
             # Generate monthly report
-            report = self.generate_monthly_report(monthly_summary)
+            run.report = self.generate_monthly_report(monthly_summary, run.started_at)
 
             # Save report
-            self.save_monthly_report(report)
+            await self.save_report(run)
 
             # Send executive briefing
-            await self.send_notifications(report, "monthly")
+            await self.send_notifications(run)
 
             self.logger.info("✅ Monthly workflow complete")
 
             return monthly_summary
 
         except Exception as e:
-            self.logger.error(f"❌ Monthly workflow failed: {str(e)}")
+            self.logger.error("❌ Monthly workflow failed: %s", e)
             raise
 
-    def generate_daily_report(self, summary: Dict) -> str:
+    def generate_daily_report(self, summary: Dict, now: Optional[datetime] = None) -> str:
         """Generate human-readable daily report"""
-        report = f"""
-{'='*70}
-🤖 AI AGENT DAILY REPORT
-{'='*70}
-Date: {datetime.now().strftime('%Y-%m-%d')}
-Execution Time: {datetime.now().strftime('%H:%M:%S')}
-
-📊 SALES DEVELOPMENT
-"""
-        sales_result = summary["results"].get("sales_dev", {})
-        if sales_result and sales_result.get("success"):
-            leads = sales_result.get("leads_generated", 0)
-            report += f"  ✅ Generated {leads} qualified leads\n"
-            report += f"  🎯 Top verticals: Healthcare, Retail, Banking\n"
-        else:
-            report += f"  ❌ Failed: {sales_result.get('error', 'Unknown')}\n"
-
-        report += f"\n🔍 MARKET INTELLIGENCE\n"
-        intel_result = summary["results"].get("market_intel", {})
-        if intel_result and intel_result.get("success"):
-            report += f"  ✅ Intelligence gathering complete\n"
-            alerts = intel_result.get("alerts", [])
-            if alerts:
-                report += f"  🚨 {len(alerts)} priority alerts\n"
-        else:
-            report += f"  ❌ Failed: {intel_result.get('error', 'Unknown')}\n"
-
-        report += f"\n👥 CUSTOMER SUCCESS\n"
-        cs_result = summary["results"].get("customer_success", {})
-        if cs_result and cs_result.get("success"):
-            report_data = cs_result.get("report", {})
-            at_risk = len(report_data.get("at_risk_customers", []))
-            expansion = len(report_data.get("expansion_opportunities", []))
-            report += f"  ✅ Health check complete\n"
-            report += f"  ⚠️  {at_risk} at-risk customers\n"
-            report += f"  💰 {expansion} expansion opportunities\n"
-        else:
-            report += f"  ❌ Failed: {cs_result.get('error', 'Unknown')}\n"
-
-        report += f"\n{'='*70}\n"
-
-        return report
+        now = now or datetime.now()
+        results = summary["results"]
+        customer_success = results.get("customer_success") or {}
+        kpis = (results.get("operations") or {}).get("ops_report", {}).get("kpi_dashboard", {})
+        return _DAILY_REPORT_TMPL.render(
+            rule=_RULE,
+            now=now,
+            sales=results.get("sales_dev") or {},
+            intel=results.get("market_intel") or {},
+            customer_success=customer_success,
+            cs_report=customer_success.get("report", {}),
+            ops=results.get("operations") or {},
+            revenue=kpis.get("revenue_kpis", {}),
+            operational=kpis.get("operational_kpis", {})
+        )
 
-    def generate_weekly_report(self, summary: Dict) -> str:
+    def generate_weekly_report(self, summary: Dict, now: Optional[datetime] = None) -> str:
         """Generate human-readable weekly report"""
-        report = f"""
-{'='*70}
+        now = now or datetime.now()
+        parts = [f"""
+{_RULE}
 💰 AI AGENT WEEKLY FINANCIAL REPORT
-{'='*70}
-Week Ending: {datetime.now().strftime('%Y-%m-%d')}
+{_RULE}
+Week Ending: {now.strftime('%Y-%m-%d')}
 
 FINANCIAL METRICS
-"""
+"""]
         metrics = summary.get("key_metrics", {})
         if metrics:
-            report += f"  ARR: ${metrics.get('current_arr', 0):,.0f}\n"
-            report += f"  MRR: ${metrics.get('current_mrr', 0):,.0f}\n"
-            report += f"  Customers: {metrics.get('customers', 0)}\n"
-            report += f"  Variance: {metrics.get('variance_percent', 0):+.1f}%\n"
-            report += f"  Burn Rate: ${metrics.get('burn_rate', 0):,.0f}/month\n"
-            report += f"  Runway: {metrics.get('runway_months', 0):.1f} months\n"
+            parts.append(f"  ARR: ${metrics.get('current_arr', 0):,.0f}\n")
+            parts.append(f"  MRR: ${metrics.get('current_mrr', 0):,.0f}\n")
+            parts.append(f"  Customers: {metrics.get('customers', 0)}\n")
+            parts.append(f"  Variance: {metrics.get('variance_percent', 0):+.1f}%\n")
+            parts.append(f"  Burn Rate: ${metrics.get('burn_rate', 0):,.0f}/month\n")
+            parts.append(f"  Runway: {metrics.get('runway_months', 0):.1f} months\n")
 
-        report += f"\n{'='*70}\n"
+        parts.append(f"\n{_RULE}\n")
 
-        return report
+        return "".join(parts)
 
-    def generate_monthly_report(self, summary: Dict) -> str:
+    def generate_monthly_report(self, summary: Dict, now: Optional[datetime] = None) -> str:
         """Generate human-readable monthly report"""
-        report = f"""
-{'='*70}
-📈 AI AGENT MONTHLY EXECUTIVE BRIEFING
-{'='*70}
-Month: {datetime.now().strftime('%B %Y')}
+        now = now or datetime.now()
+        return _MONTHLY_REPORT_TMPL.format(month=now.strftime('%B %Y'))
 
-MONTHLY PERFORMANCE REVIEW
-[Comprehensive analysis would be generated here]
+    def _start_run(self, kind: str) -> WorkflowRun:
+        """Stamp a new workflow run and fix its report path"""
+        now = datetime.now()
+        return WorkflowRun(kind, now, self.reports_dir / now.strftime(_REPORT_FILENAMES[kind]))
 
-STRATEGIC RECOMMENDATIONS
-[AI-generated strategic recommendations would be included here]
+    async def save_report(self, run: WorkflowRun):
+        """Write the run's report gzip-compressed (served as-is by the dashboard) off the event loop"""
+        await asyncio.to_thread(_sync_write, run.filepath, run.report)
+        self.logger.info("📄 %s report saved: %s", run.kind.capitalize(), run.filepath.name)
 
-{'='*70}
-"""
-        return report
-
-    def save_daily_report(self, report: str):
-        """Save daily report to file"""
-        filename = f"daily_report_{datetime.now().strftime('%Y%m%d')}.txt"
-        filepath = self.reports_dir / filename
-        with open(filepath, 'w') as f:
-            f.write(report)
-        self.logger.info(f"📄 Daily report saved: {filename}")
-
-    def save_weekly_report(self, report: str):
-        """Save weekly report to file"""
-        filename = f"weekly_report_{datetime.now().strftime('%Y%m%d')}.txt"
-        filepath = self.reports_dir / filename
-        with open(filepath, 'w') as f:
-            f.write(report)
-        self.logger.info(f"📄 Weekly report saved: {filename}")
-
-    def save_monthly_report(self, report: str):
-        """Save monthly report to file"""
-        filename = f"monthly_report_{datetime.now().strftime('%Y%m')}.txt"
-        filepath = self.reports_dir / filename
-        with open(filepath, 'w') as f:
-            f.write(report)
-        self.logger.info(f"📄 Monthly report saved: {filename}")
-
-    async def send_notifications(self, report: str, frequency: str):
+    async def send_notifications(self, run: WorkflowRun):
         """Send notifications (email, Slack, etc.)"""
         # In production, integrate with email/Slack
-        self.logger.info(f"📤 {frequency.capitalize()} notifications sent")
+        self.logger.info("📤 %s notifications sent", run.kind.capitalize())
         # TODO: Implement email/Slack integration
 
+    def _normalize_result(self, result: Any) -> Dict:
+        """Turn an exception returned by gather() into a failed agent result"""
+        if isinstance(result, BaseException):
+            self.logger.error("❌ Agent failed: %s", result)
+            return {"success": False, "error": str(result)}
+        return result
+
     def extract_key_metrics(self, financial_results: Dict) -> Dict:
         """Extract key metrics from financial results"""
         if not financial_results or not financial_results.get("success"):
@@ -348,45 +438,44 @@ STRATEGIC RECOMMENDATIONS
         """Schedule all agent workflows"""
         self.logger.info("⏰ Scheduling workflows...")
 
-        # Daily tasks - 8:00 AM
-        schedule.every().day.at("08:00").do(
-            lambda: asyncio.run(self.daily_workflow())
+        self.scheduler = AsyncIOScheduler(
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": SCHEDULER_MISFIRE_GRACE}
         )
 
+        # Daily tasks - 8:00 AM
+        self.scheduler.add_job(self.daily_workflow, CronTrigger(hour=8, minute=0))
+
         # Weekly tasks - Monday 9:00 AM
-        schedule.every().monday.at("09:00").do(
-            lambda: asyncio.run(self.weekly_workflow())
-        )
+        self.scheduler.add_job(self.weekly_workflow, CronTrigger(day_of_week="mon", hour=9, minute=0))
 
         # Monthly tasks - 1st of month at 10:00 AM
-        schedule.every().day.at("10:00").do(
-            lambda: self.run_monthly_if_first() and asyncio.run(self.monthly_workflow())
-        )
+        self.scheduler.add_job(self.monthly_workflow, CronTrigger(day=1, hour=10, minute=0))
 
         self.logger.info("✅ Workflows scheduled:")
         self.logger.info("   📅 Daily: 8:00 AM (lead gen, intel, health checks)")
         self.logger.info("   📅 Weekly: Monday 9:00 AM (financial update)")
         self.logger.info("   📅 Monthly: 1st at 10:00 AM (executive review)")
 
-    def run_monthly_if_first(self) -> bool:
-        """Check if today is the 1st of the month"""
-        return datetime.now().day == 1
+    async def _scheduler_main(self):
+        """Start the scheduler on this event loop and keep it alive"""
+        try:
+            await self._ensure_http()
+            self.scheduler.start()
+            await asyncio.Event().wait()
+        finally:
+            if self.scheduler.running:
+                self.scheduler.shutdown(wait=False)
+            await self.aclose()
 
     def run_forever(self):
         """Keep orchestrator running 24/7"""
         self.logger.info("🚀 Agent Orchestrator ACTIVE - Running 24/7")
         self.logger.info("   Press Ctrl+C to stop")
 
-        while True:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            except KeyboardInterrupt:
-                self.logger.info("\n👋 Orchestrator shutting down...")
-                break
-            except Exception as e:
-                self.logger.error(f"❌ Error in orchestrator: {str(e)}")
-                time.sleep(60)
+        try:
+            run_async(self._scheduler_main())
+        except KeyboardInterrupt:
+            self.logger.info("\n👋 Orchestrator shutting down...")
 
 async def test_agents():
     """Test all agents immediately"""
@@ -394,11 +483,14 @@ async def test_agents():
 
     orchestrator = AgentOrchestrator()
 
-    print("Running daily workflow test...")
-    await orchestrator.daily_workflow()
+    try:
+        print("Running daily workflow test...")
+        await orchestrator.daily_workflow()
 
-    print("\nRunning weekly workflow test...")
-    await orchestrator.weekly_workflow()
+        print("\nRunning weekly workflow test...")
+        await orchestrator.weekly_workflow()
+    finally:
+        await orchestrator.aclose()
 
     print("\n✅ Agent testing complete!")
 
@@ -415,7 +507,7 @@ def main():
 
     if args.test:
         # Test mode - run agents immediately
-        asyncio.run(test_agents())
+        run_async(test_agents())
     elif args.daemon:
         # Daemon mode - schedule and run forever
         orchestrator.schedule_workflows()
@@ -431,7 +523,7 @@ def main():
         choice = input("\nSelect option: ")
 
         if choice == "1":
-            asyncio.run(test_agents())
+            run_async(test_agents())
         elif choice == "2":
             orchestrator.schedule_workflows()
             orchestrator.run_forever()
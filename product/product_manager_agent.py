@@ -5,19 +5,179 @@ Analyzes customer feedback, prioritizes features, maintains product roadmap
 """
 import os
 import sys
-import asyncio
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence
+
+import numpy as np
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, freeze, day_stamp, run_async
+from kernels import priority_rice_totals
+
+# Priority labels as int8 codes for the backlog kernels (anything else is -1)
+_PRIORITY_CODES = {"P0": 0, "P1": 1}
+
+# Two-week sprints
+_SPRINT_LENGTH = timedelta(days=14)
+
+# Static demo payloads - built once and shared read-only between calls.
+# Percentages are plain numbers (12.0 == 12%), formatted at render time
+_CUSTOMER_FEEDBACK = freeze({
+    "feedback_volume": {
+        "support_tickets": 145,
+        "customer_interviews": 12,
+        "nps_responses": 89,
+        "feature_requests": 34,
+        "bug_reports": 23
+    },
+    "top_feature_requests": [
+        {"feature": "Multi-site dashboard view", "vertical": "retail-chains", "votes": 28, "priority": "high"},
+        {"feature": "Automated firmware updates", "vertical": "healthcare", "votes": 22, "priority": "high"},
+        {"feature": "Integration with ServiceNow", "vertical": "banking-financial", "votes": 18, "priority": "medium"},
+        {"feature": "Mobile app for field technicians", "vertical": "msp-platform", "votes": 16, "priority": "high"},
+        {"feature": "Custom alert templates", "vertical": "restaurant-chains", "votes": 14, "priority": "medium"},
+    ],
+    "satisfaction_trend_qoq_pct": 12.0,
+    "churn_risk_indicators": ["slow feature delivery", "missing mobile app"]
+})
+
+# Backlog columns and their dtypes; confidence stays float64 so scores match the Python RICE formula
+_BACKLOG_DTYPES = {
+    "name": object,
+    "reach": np.int32,
+    "impact": np.int8,
+    "confidence": np.float64,
+    "effort": np.int8,
+    "priority": object,
+    "target_quarter": object,
+    "vertical": object,
+}
+
+def _to_columns(rows: List[Dict]) -> Dict[str, np.ndarray]:
+    """Convert backlog rows to a struct-of-arrays layout (one NumPy array per field)"""
+    return {key: np.array([r[key] for r in rows], dtype=dtype) for key, dtype in _BACKLOG_DTYPES.items()}
+
+def _rank_by_rice(backlog: Dict[str, np.ndarray]) -> List[Dict]:
+    """Score features with RICE (reach * impact * confidence / effort), highest first"""
+    scores = backlog["reach"] * backlog["impact"] * backlog["confidence"] / backlog["effort"]
+    order = np.argsort(-scores, kind="stable")
+    columns = {key: backlog[key][order].tolist() for key in _BACKLOG_DTYPES}
+    columns["rice_score"] = scores[order].tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+_BACKLOG = _to_columns([
+    {
+        "name": "Multi-site dashboard view",
+        "reach": 8500,  # users affected
+        "impact": 3,  # 0-3 scale
+        "confidence": 0.9,  # 0-1
+        "effort": 6,  # person-weeks
+        "priority": "P0",
+        "target_quarter": "Q2 2025",
+        "vertical": "retail-chains"
+    },
+    {
+        "name": "Automated firmware updates",
+        "reach": 12000,
+        "impact": 3,
+        "confidence": 0.8,
+        "effort": 8,
+        "priority": "P0",
+        "target_quarter": "Q2 2025",
+        "vertical": "healthcare"
+    },
+    {
+        "name": "Mobile app for field technicians",
+        "reach": 3500,
+        "impact": 3,
+        "confidence": 0.7,
+        "effort": 12,
+        "priority": "P1",
+        "target_quarter": "Q3 2025",
+        "vertical": "msp-platform"
+    },
+    {
+        "name": "ServiceNow integration",
+        "reach": 4000,
+        "impact": 2,
+        "confidence": 0.9,
+        "effort": 4,
+        "priority": "P1",
+        "target_quarter": "Q2 2025",
+        "vertical": "banking-financial"
+    },
+    {
+        "name": "Custom alert templates",
+        "reach": 6000,
+        "impact": 2,
+        "confidence": 0.95,
+        "effort": 3,
+        "priority": "P1",
+        "target_quarter": "Q2 2025",
+        "vertical": "restaurant-chains"
+    },
+])
+_FEATURE_BACKLOG = freeze(_rank_by_rice(_BACKLOG))
+
+_PRODUCT_ROADMAP = freeze([
+    {
+        "quarter": "Q2 2025",
+        "theme": "Enterprise Scale & Multi-Vendor Expansion",
+        "major_features": [
+            "Multi-site dashboard view (retail-chains)",
+            "Automated firmware updates (healthcare)",
+            "ServiceNow integration (banking-financial)",
+            "Custom alert templates (restaurant-chains)"
+        ],
+        "status": "in_planning"
+    },
+    {
+        "quarter": "Q3 2025",
+        "theme": "Mobile & Field Operations",
+        "major_features": [
+            "Mobile app for field technicians (msp-platform)",
+            "Offline mode support",
+            "QR code device provisioning"
+        ],
+        "status": "planned"
+    },
+    {
+        "quarter": "Q4 2025",
+        "theme": "AI & Automation Enhancements",
+        "major_features": [
+            "Predictive failure detection",
+            "Auto-remediation workflows",
+            "Advanced analytics dashboard"
+        ],
+        "status": "planned"
+    }
+])
 
 class ProductManagerAgent(BaseAgent):
     """AI agent for product management and roadmap planning"""
 
+    __slots__ = ()
+
+    # Product areas
+    product_areas = (
+        "ai_voice_control", "multi_vendor_integration", "network_monitoring",
+        "alerting_automation", "reporting_dashboards", "api_platform",
+        "mobile_apps", "security_features", "dns_certificate_saas"
+    )
+
+    # All 10 verticals
+    target_verticals = (
+        "healthcare", "retail-chains", "restaurant-chains",
+        "banking-financial", "education-government", "manufacturing",
+        "msp-platform", "hospitality-hotels", "franchise-operations",
+        "dns-certificate-saas"
+    )
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Product Manager Agent",
@@ -25,43 +185,39 @@ class ProductManagerAgent(BaseAgent):
             config=config or {}
         )
 
-        # Product areas
-        self.product_areas = [
-            "ai_voice_control", "multi_vendor_integration", "network_monitoring",
-            "alerting_automation", "reporting_dashboards", "api_platform",
-            "mobile_apps", "security_features", "dns_certificate_saas"
-        ]
-
-        # All 10 verticals
-        self.target_verticals = [
-            "healthcare", "retail-chains", "restaurant-chains",
-            "banking-financial", "education-government", "manufacturing",
-            "msp-platform", "hospitality-hotels", "franchise-operations",
-            "dns-certificate-saas"
-        ]
-
         self.logger.info(f"🎯 Managing {len(self.product_areas)} product areas across {len(self.target_verticals)} verticals")
 
-    async def weekly_product_planning(self) -> Dict[str, Any]:
-        """Execute weekly product planning workflow"""
+    async def weekly_product_planning(self, force: bool = False) -> Dict[str, Any]:
+        """Execute weekly product planning workflow (reuses today's plan unless force)"""
         self.logger.info("🗺️ Starting weekly product planning")
 
         try:
-            # Step 1: Analyze customer feedback
-            feedback_analysis = await self.analyze_customer_feedback()
+            # One timestamp for the sprint window, report date and context key
+            now = datetime.now()
+            context_id = f"product_plan_{day_stamp(now)}"
 
-            # Step 2: Prioritize features
-            feature_priorities = await self.prioritize_features()
+            # Inputs are static per day, so a re-run on the same day reuses the saved plan
+            if not force:
+                cached_plan = await self.aload_context(context_id)
+                if cached_plan is not None:
+                    self.logger.info(f"♻️ Reusing today's product plan ({context_id})")
+                    return {
+                        "success": True,
+                        "product_plan": cached_plan
+                    }
 
-            # Step 3: Update product roadmap
-            roadmap_updates = await self.update_product_roadmap()
-
-            # Step 4: Generate sprint planning
-            sprint_plan = await self.generate_sprint_plan()
+            # Steps 1-4 are independent: feedback analysis, feature
+            # prioritization, roadmap and sprint planning run concurrently
+            feedback_analysis, feature_priorities, roadmap_updates, sprint_plan = await self.gather_steps(
+                self.analyze_customer_feedback(),
+                self.prioritize_features(),
+                self.update_product_roadmap(),
+                self.generate_sprint_plan(now)
+            )
 
             # Compile results
             product_plan = {
-                "date": datetime.now().isoformat(),
+                "date": now.isoformat(),
                 "feedback_analysis": feedback_analysis,
                 "feature_priorities": feature_priorities,
                 "roadmap_updates": roadmap_updates,
@@ -70,14 +226,13 @@ class ProductManagerAgent(BaseAgent):
             }
 
             # Save context
-            self.save_context(
-                f"product_plan_{datetime.now().strftime('%Y%m%d')}",
-                product_plan
-            )
+            self.save_context(context_id, product_plan)
 
             self.logger.info(f"✅ Product planning complete - {len(feature_priorities)} features prioritized")
-            self.log_metric("features_prioritized", len(feature_priorities))
-            self.log_metric("roadmap_items", len(roadmap_updates))
+            self.log_metrics(
+                features_prioritized=len(feature_priorities),
+                roadmap_items=len(roadmap_updates)
+            )
 
             return {
                 "success": True,
@@ -91,139 +246,23 @@ class ProductManagerAgent(BaseAgent):
                 "error": str(e)
             }
 
-    async def analyze_customer_feedback(self) -> Dict[str, Any]:
+    async def analyze_customer_feedback(self) -> Mapping[str, Any]:
         """Analyze customer feedback and feature requests"""
-        feedback_sources = {
-            "support_tickets": 145,
-            "customer_interviews": 12,
-            "nps_responses": 89,
-            "feature_requests": 34,
-            "bug_reports": 23
-        }
-
-        top_requests = [
-            {"feature": "Multi-site dashboard view", "vertical": "retail-chains", "votes": 28, "priority": "high"},
-            {"feature": "Automated firmware updates", "vertical": "healthcare", "votes": 22, "priority": "high"},
-            {"feature": "Integration with ServiceNow", "vertical": "banking-financial", "votes": 18, "priority": "medium"},
-            {"feature": "Mobile app for field technicians", "vertical": "msp-platform", "votes": 16, "priority": "high"},
-            {"feature": "Custom alert templates", "vertical": "restaurant-chains", "votes": 14, "priority": "medium"},
-        ]
+        return _CUSTOMER_FEEDBACK
 
-        return {
-            "feedback_volume": feedback_sources,
-            "top_feature_requests": top_requests,
-            "satisfaction_trend": "+12% this quarter",
-            "churn_risk_indicators": ["slow feature delivery", "missing mobile app"]
-        }
-
-    async def prioritize_features(self) -> List[Dict]:
+    async def prioritize_features(self) -> Sequence[Mapping[str, Any]]:
         """Prioritize features using RICE framework (Reach, Impact, Confidence, Effort)"""
-        features = [
-            {
-                "name": "Multi-site dashboard view",
-                "reach": 8500,  # users affected
-                "impact": 3,  # 0-3 scale
-                "confidence": 0.9,  # 0-1
-                "effort": 6,  # person-weeks
-                "rice_score": (8500 * 3 * 0.9) / 6,
-                "priority": "P0",
-                "target_quarter": "Q2 2025",
-                "vertical": "retail-chains"
-            },
-            {
-                "name": "Automated firmware updates",
-                "reach": 12000,
-                "impact": 3,
-                "confidence": 0.8,
-                "effort": 8,
-                "rice_score": (12000 * 3 * 0.8) / 8,
-                "priority": "P0",
-                "target_quarter": "Q2 2025",
-                "vertical": "healthcare"
-            },
-            {
-                "name": "Mobile app for field technicians",
-                "reach": 3500,
-                "impact": 3,
-                "confidence": 0.7,
-                "effort": 12,
-                "rice_score": (3500 * 3 * 0.7) / 12,
-                "priority": "P1",
-                "target_quarter": "Q3 2025",
-                "vertical": "msp-platform"
-            },
-            {
-                "name": "ServiceNow integration",
-                "reach": 4000,
-                "impact": 2,
-                "confidence": 0.9,
-                "effort": 4,
-                "rice_score": (4000 * 2 * 0.9) / 4,
-                "priority": "P1",
-                "target_quarter": "Q2 2025",
-                "vertical": "banking-financial"
-            },
-            {
-                "name": "Custom alert templates",
-                "reach": 6000,
-                "impact": 2,
-                "confidence": 0.95,
-                "effort": 3,
-                "rice_score": (6000 * 2 * 0.95) / 3,
-                "priority": "P1",
-                "target_quarter": "Q2 2025",
-                "vertical": "restaurant-chains"
-            },
-        ]
-
-        # Sort by RICE score
-        features.sort(key=lambda x: x["rice_score"], reverse=True)
-
-        return features
-
-    async def update_product_roadmap(self) -> List[Dict]:
-        """Update quarterly product roadmap"""
-        roadmap = [
-            {
-                "quarter": "Q2 2025",
-                "theme": "Enterprise Scale & Multi-Vendor Expansion",
-                "major_features": [
-                    "Multi-site dashboard view (retail-chains)",
-                    "Automated firmware updates (healthcare)",
-                    "ServiceNow integration (banking-financial)",
-                    "Custom alert templates (restaurant-chains)"
-                ],
-                "status": "in_planning"
-            },
-            {
-                "quarter": "Q3 2025",
-                "theme": "Mobile & Field Operations",
-                "major_features": [
-                    "Mobile app for field technicians (msp-platform)",
-                    "Offline mode support",
-                    "QR code device provisioning"
-                ],
-                "status": "planned"
-            },
-            {
-                "quarter": "Q4 2025",
-                "theme": "AI & Automation Enhancements",
-                "major_features": [
-                    "Predictive failure detection",
-                    "Auto-remediation workflows",
-                    "Advanced analytics dashboard"
-                ],
-                "status": "planned"
-            }
-        ]
+        return _FEATURE_BACKLOG
 
-        return roadmap
+    async def update_product_roadmap(self) -> Sequence[Mapping[str, Any]]:
+        """Update quarterly product roadmap"""
+        return _PRODUCT_ROADMAP
 
-    async def generate_sprint_plan(self) -> Dict[str, Any]:
+    async def generate_sprint_plan(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate 2-week sprint plan"""
         sprint_number = 42
-        sprint_start = datetime.now()
-        sprint_end = sprint_start + timedelta(days=14)
+        sprint_start = now or datetime.now()
+        sprint_end = sprint_start + _SPRINT_LENGTH
 
         return {
             "sprint_number": sprint_number,
@@ -244,13 +283,19 @@ class ProductManagerAgent(BaseAgent):
 
     def calculate_product_metrics(self, features: List) -> Dict[str, Any]:
         """Calculate product health metrics"""
+        n = len(features)
+        priority_codes = np.fromiter(
+            (_PRIORITY_CODES.get(f.get("priority"), -1) for f in features), dtype=np.int8, count=n)
+        rice_scores = np.fromiter((f.get("rice_score", 0) for f in features), dtype=np.float64, count=n)
+        p0, p1, total_rice = priority_rice_totals(priority_codes, rice_scores)
+
         return {
-            "features_in_backlog": len(features),
-            "p0_features": len([f for f in features if f.get("priority") == "P0"]),
-            "p1_features": len([f for f in features if f.get("priority") == "P1"]),
-            "avg_rice_score": sum([f.get("rice_score", 0) for f in features]) / len(features) if features else 0,
-            "roadmap_confidence": "82%",
-            "customer_satisfaction_trend": "+12%"
+            "features_in_backlog": n,
+            "p0_features": p0,
+            "p1_features": p1,
+            "avg_rice_score": total_rice / n if n else 0,
+            "roadmap_confidence_pct": 82.0,
+            "customer_satisfaction_trend_pct": 12.0
         }
 
     async def run(self) -> Dict[str, Any]:
@@ -260,8 +305,11 @@ class ProductManagerAgent(BaseAgent):
 async def main():
     """Test product manager agent"""
     agent = ProductManagerAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -5,19 +5,82 @@ Tracks competitors, industry news, market opportunities
 """
 import os
 import sys
-import asyncio
-import json
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, freeze, day_stamp, run_async
+
+# Max priority insights (and alerts) per intel report
+INSIGHT_LIMIT = 5
+
+# Static market assessments - built once and shared read-only between runs
+_MARKET_OPPORTUNITIES = freeze([
+    {
+        "type": "market_expansion",
+        "description": "Healthcare vertical showing 15% growth",
+        "potential_revenue": "$5M-$10M",
+        "confidence": "high",
+        "next_steps": ["Research healthcare M&A activity", "Contact healthcare system CIOs"]
+    },
+    {
+        "type": "competitive_weakness",
+        "description": "Competitor X lacks multi-vendor support",
+        "potential_impact": "Win enterprise deals",
+        "confidence": "medium",
+        "next_steps": ["Create comparison content", "Target their customers"]
+    }
+])
+
+_MARKET_TRENDS = freeze({
+    "ai_adoption": {
+        "trend": "accelerating",
+        "impact": "high",
+        "our_position": "leader"
+    },
+    "multi_vendor_demand": {
+        "trend": "increasing",
+        "impact": "high",
+        "our_position": "strong"
+    },
+    "msp_consolidation": {
+        "trend": "growing",
+        "impact": "medium",
+        "our_position": "opportunity"
+    }
+})
 
 class MarketIntelligenceAgent(BaseAgent):
     """AI agent for market intelligence and competitive monitoring"""
 
+    __slots__ = ()
+
+    # Competitors to monitor
+    competitors = (
+        "Cisco Meraki",
+        "Auvik",
+        "Domotz",
+        "SolarWinds",
+        "PRTG Network Monitor"
+    )
+
+    # Per-competitor summary lines, formatted once for the fixed competitor list
+    _competitor_summaries = freeze(dict(zip(competitors, map("Monitoring {} for product updates".format, competitors))))
+
+    # Topics to monitor
+    monitoring_topics = (
+        "network management",
+        "AI networking",
+        "MSP tools",
+        "network automation",
+        "multi-vendor management"
+    )
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Market Intelligence Agent",
@@ -25,72 +88,64 @@ class MarketIntelligenceAgent(BaseAgent):
             config=config or {}
         )
 
-        # Competitors to monitor
-        self.competitors = [
-            "Cisco Meraki",
-            "Auvik",
-            "Domotz",
-            "SolarWinds",
-            "PRTG Network Monitor"
-        ]
-
-        # Topics to monitor
-        self.monitoring_topics = [
-            "network management",
-            "AI networking",
-            "MSP tools",
-            "network automation",
-            "multi-vendor management"
-        ]
+        self.logger.info("👁️  Monitoring %d competitors", len(self.competitors))
 
-        self.logger.info(f"👁️  Monitoring {len(self.competitors)} competitors")
-
-    async def daily_intelligence_gathering(self) -> Dict[str, Any]:
-        """Execute daily intelligence gathering workflow"""
+    async def daily_intelligence_gathering(self, force: bool = False) -> Dict[str, Any]:
+        """Execute daily intelligence gathering workflow (reuses today's report unless force)"""
         self.logger.info("🔍 Starting daily market intelligence gathering")
 
         try:
-            # Step 1: Monitor competitors
-            competitor_updates = await self.monitor_competitors()
-
-            # Step 2: Track industry news
-            industry_news = await self.track_industry_news()
-
-            # Step 3: Identify opportunities
-            opportunities = await self.identify_opportunities()
+            now = datetime.now()
+            context_id = f"intel_report_{day_stamp(now)}"
+
+            # A re-run on the same day reuses the saved report
+            if not force:
+                cached_report = await self.aload_context(context_id)
+                if cached_report is not None:
+                    self.logger.info("♻️ Reusing today's intel report (%s)", context_id)
+                    return {
+                        "success": True,
+                        "report": cached_report,
+                        "alerts": self.generate_alerts(cached_report)
+                    }
+
+            # Steps 1-4 are independent: competitor monitoring, industry news,
+            # opportunity identification and trend analysis run concurrently
+            competitor_updates, industry_news, opportunities, trends = await self.gather_steps(
+                self.monitor_competitors(),
+                self.track_industry_news(),
+                self.identify_opportunities(),
+                self.analyze_trends()
+            )
 
-            # Step 4: Analyze trends
-            trends = await self.analyze_trends()
+            priority_insights, alerts = self.prioritize_insights(
+                competitor_updates, industry_news, opportunities
+            )
 
             # Compile intel report
             intel_report = {
-                "date": datetime.now().isoformat(),
+                "date": now.isoformat(),
                 "competitor_updates": competitor_updates,
                 "industry_news": industry_news,
                 "opportunities": opportunities,
                 "trends": trends,
-                "priority_insights": self.prioritize_insights(
-                    competitor_updates, industry_news, opportunities
-                )
+                "priority_insights": priority_insights
             }
 
             # Save daily report
-            self.save_context(
-                f"intel_report_{datetime.now().strftime('%Y%m%d')}",
-                intel_report
-            )
+            await self.asave_context(context_id, intel_report)
 
-            self.logger.info(f"✅ Intelligence gathered - {len(competitor_updates)} competitor updates")
+            self.logger.info("✅ Intelligence gathered - %d competitor updates", len(competitor_updates))
             self.log_metric("daily_intel_items", len(competitor_updates) + len(industry_news))
 
             return {
                 "success": True,
                 "report": intel_report,
-                "alerts": self.generate_alerts(intel_report)
+                "alerts": alerts
             }
 
         except Exception as e:
-            self.logger.error(f"❌ Intelligence gathering failed: {str(e)}")
+            self.logger.error("❌ Intelligence gathering failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -98,92 +153,55 @@ class MarketIntelligenceAgent(BaseAgent):
 
     async def monitor_competitors(self) -> List[Dict]:
         """Monitor competitor activity"""
-        updates = []
+        checked_at = datetime.now().isoformat()
+        return await self.fan_out(partial(self._fetch_competitor, checked_at=checked_at), self.competitors)
 
+    async def _fetch_competitor(self, competitor: str, checked_at: str) -> Dict[str, Any]:
+        """Check one competitor for updates"""
         # In production, use web scraping, RSS feeds, or news APIs
         # Simulate competitor monitoring
-        for competitor in self.competitors:
-            # Check for updates (simulated)
-            update = {
-                "competitor": competitor,
-                "type": "product_update",
-                "summary": f"Monitoring {competitor} for product updates",
-                "timestamp": datetime.now().isoformat(),
-                "impact": "medium",
-                "action_required": False
-            }
-            updates.append(update)
-
-        return updates
+        return {
+            "competitor": competitor,
+            "type": "product_update",
+            "summary": self._competitor_summaries[competitor],
+            "timestamp": checked_at,
+            "impact": "medium",
+            "action_required": False
+        }
 
     async def track_industry_news(self) -> List[Dict]:
         """Track industry news and trends"""
-        news_items = []
-
-        # In production, integrate with news APIs, RSS feeds
-        # Simulate news tracking
         topics = [
             "AI in network management",
             "MSP market growth",
             "Network security trends"
         ]
+        checked_at = datetime.now().isoformat()
+        return await self.fan_out(partial(self._fetch_topic_news, checked_at=checked_at), topics)
 
-        for topic in topics:
-            news_items.append({
-                "topic": topic,
-                "source": "industry_news",
-                "relevance": "high",
-                "timestamp": datetime.now().isoformat()
-            })
-
-        return news_items
+    async def _fetch_topic_news(self, topic: str, checked_at: str) -> Dict[str, Any]:
+        """Fetch news for one topic"""
+        # In production, integrate with news APIs, RSS feeds
+        # Simulate news tracking
+        return {
+            "topic": topic,
+            "source": "industry_news",
+            "relevance": "high",
+            "timestamp": checked_at
+        }
 
-    async def identify_opportunities(self) -> List[Dict]:
+    async def identify_opportunities(self) -> Sequence[Mapping[str, Any]]:
         """Identify market opportunities"""
-        opportunities = []
-
-        # Analyze market gaps and opportunities
-        opportunities.append({
-            "type": "market_expansion",
-            "description": "Healthcare vertical showing 15% growth",
-            "potential_revenue": "$5M-$10M",
-            "confidence": "high",
-            "next_steps": ["Research healthcare M&A activity", "Contact healthcare system CIOs"]
-        })
-
-        opportunities.append({
-            "type": "competitive_weakness",
-            "description": "Competitor X lacks multi-vendor support",
-            "potential_impact": "Win enterprise deals",
-            "confidence": "medium",
-            "next_steps": ["Create comparison content", "Target their customers"]
-        })
-
-        return opportunities
-
-    async def analyze_trends(self) -> Dict[str, Any]:
+        return _MARKET_OPPORTUNITIES
+
+    async def analyze_trends(self) -> Mapping[str, Any]:
         """Analyze market trends"""
-        return {
-            "ai_adoption": {
-                "trend": "accelerating",
-                "impact": "high",
-                "our_position": "leader"
-            },
-            "multi_vendor_demand": {
-                "trend": "increasing",
-                "impact": "high",
-                "our_position": "strong"
-            },
-            "msp_consolidation": {
-                "trend": "growing",
-                "impact": "medium",
-                "our_position": "opportunity"
-            }
-        }
+        return _MARKET_TRENDS
 
-    def prioritize_insights(self, competitor_updates: List, news: List, opportunities: List) -> List[Dict]:
-        """Prioritize intelligence insights"""
+    def prioritize_insights(self, competitor_updates: List, news: List, opportunities: List) -> Tuple[List[Dict], List[str]]:
+        """Prioritize intelligence insights (top 5) and build their alerts in the same pass"""
         priority_insights = []
+        alerts = []
 
         # High-impact opportunities
         for opp in opportunities:
@@ -194,21 +212,28 @@ class MarketIntelligenceAgent(BaseAgent):
                     "insight": opp["description"],
                     "action": opp["next_steps"][0] if opp.get("next_steps") else "Review"
                 })
+                alerts.append(f"🚨 OPPORTUNITY: {opp['description']}")
+                if len(priority_insights) == INSIGHT_LIMIT:
+                    return priority_insights, alerts
 
         # Critical competitive threats
         for update in competitor_updates:
             if update.get("action_required"):
+                insight = f"{update['competitor']}: {update['summary']}"
                 priority_insights.append({
                     "type": "competitive_threat",
                     "priority": "high",
-                    "insight": f"{update['competitor']}: {update['summary']}",
+                    "insight": insight,
                     "action": "Immediate response required"
                 })
+                alerts.append(f"🚨 COMPETITIVE_THREAT: {insight}")
+                if len(priority_insights) == INSIGHT_LIMIT:
+                    break
 
-        return priority_insights[:5]  # Top 5
+        return priority_insights, alerts
 
     def generate_alerts(self, intel_report: Dict) -> List[str]:
-        """Generate intelligence alerts"""
+        """Generate intelligence alerts for a saved report"""
         alerts = []
 
         priority_insights = intel_report.get("priority_insights", [])
@@ -226,8 +251,11 @@ class MarketIntelligenceAgent(BaseAgent):
 async def main():
     """Test market intelligence agent"""
     agent = MarketIntelligenceAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -6,19 +6,110 @@ Researches target companies, identifies decision makers, generates outreach
 import os
 import sys
 import asyncio
+import functools
+import heapq
 import json
-from datetime import datetime, date
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-import requests
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
+
+import numpy as np
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from base_agent import BaseAgent
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+from base_agent import BaseAgent, freeze, day_stamp, run_async
+from kernels import lead_scores
+
+# Concurrent outbound lookups per fan-out: company research and contact search
+RESEARCH_CONCURRENCY = 16
+CONTACT_CONCURRENCY = 32
+
+# HubSpot bulk company upsert, enabled with config "crm_sync"; at most 100 records per request
+# (config "crm_batch_size" overrides). Records are keyed on a unique-value company property
+# (config "crm_id_property") so re-runs update companies instead of duplicating them.
+HUBSPOT_BATCH_URL = "https://api.hubapi.com/crm/v3/objects/companies/batch/upsert"
+HUBSPOT_BATCH_HOST = "api.hubapi.com"
+HUBSPOT_MAX_BATCH_SIZE = 100
+DEFAULT_CRM_ID_PROPERTY = "lead_key"
+
+# Target companies named in each vertical's GTM plan
+VERTICAL_COMPANIES: Dict[str, Tuple[str, ...]] = {
+    "healthcare": (
+        "CityMD", "MinuteClinic", "Aspen Dental", "Heartland Dental",
+        "VCA", "Banfield", "Brookdale", "Five Star"
+    ),
+    "retail-chains": ("CVS", "Walgreens", "7-Eleven", "Wawa", "Target"),
+    "banking-financial": (
+        "Navy Federal", "PenFed", "Alliant Credit Union",
+        "SchoolsFirst Federal Credit Union"
+    ),
+    "education-government": (
+        "Los Angeles Unified", "Chicago Public Schools",
+        "Miami-Dade County Public Schools"
+    ),
+}
+
+# One alternation per vertical so a plan is scanned once for all its companies
+# (longest names first so a name never matches as a prefix of a longer one)
+VERTICAL_REGEX: Dict[str, "re.Pattern[str]"] = {
+    vertical: re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, sorted(names, key=len, reverse=True))))
+    for vertical, names in VERTICAL_COMPANIES.items()
+}
+
+# Decision-maker roles to contact per vertical
+VERTICAL_ROLES: Dict[str, Tuple[str, ...]] = {
+    "healthcare": ("CIO", "VP of IT", "CISO", "COO"),
+    "retail-chains": ("CIO", "VP of IT", "Director of Store Operations"),
+    "banking-financial": ("CIO", "CISO", "VP of Technology", "Chief Technology Officer"),
+}
+DEFAULT_ROLES = ("CIO", "VP of IT", "Director of Technology")
+
+# Verticals whose leads get a qualification score boost
+PRIORITY_VERTICALS = frozenset({"healthcare", "retail-chains"})
+
+# Random jitter for the placeholder qualification scores
+_rng = np.random.default_rng()
+
+@dataclass(slots=True)
+class Lead:
+    """One qualified company with its decision makers (serialized as a JSON object)"""
+    company: Mapping[str, str]
+    vertical: str
+    contacts: List[Dict[str, str]]
+    research_date: str
+    qualification_score: float = 0.0
+
+@functools.lru_cache(maxsize=64)
+def _parse_gtm_cached(gtm_path: str, mtime_ns: int, vertical: str) -> Tuple[Mapping[str, str], ...]:
+    """Target companies for a GTM plan file; mtime_ns in the key drops stale entries when the file changes"""
+    with open(gtm_path, 'r') as f:
+        content = f.read()
+
+    names = VERTICAL_COMPANIES.get(vertical, ())
+    pattern = VERTICAL_REGEX.get(vertical)
+    mentioned = set(pattern.findall(content)) if pattern is not None else set()
+
+    # Companies the plan names, in table order; a plan that names none gets the whole table
+    if mentioned:
+        return tuple(
+            freeze({"name": company, "vertical": vertical, "source": "gtm_plan"})
+            for company in names if company in mentioned
+        )
+    return tuple(
+        freeze({"name": company, "vertical": vertical, "source": "vertical_defaults"})
+        for company in names
+    )
 
 class LeadGenerationAgent(BaseAgent):
     """AI agent for autonomous lead generation and qualification"""
 
+    __slots__ = ("daily_lead_target", "daily_outreach_target", "gtm_plans_dir", "target_verticals")
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__(
             name="Lead Generation Agent",
@@ -39,60 +130,74 @@ class LeadGenerationAgent(BaseAgent):
         self.daily_lead_target = 50
         self.daily_outreach_target = 50
 
-        self.logger.info(f"🎯 Targeting {len(self.target_verticals)} verticals")
+        self.logger.info("🎯 Targeting %d verticals", len(self.target_verticals))
 
     async def daily_lead_generation(self) -> Dict[str, Any]:
         """Execute daily lead generation workflow"""
         self.logger.info("🚀 Starting daily lead generation workflow")
 
-        task_id = f"lead_gen_{datetime.now().strftime('%Y%m%d')}"
+        # One timestamp for the context key and every lead's research date
+        now = datetime.now()
+        task_id = f"lead_gen_{day_stamp(now)}"
+        research_date = now.date().isoformat()
         leads = []
 
         try:
-            # Step 1: Research companies in each vertical
-            for vertical in self.target_verticals:
-                self.logger.info(f"📊 Researching {vertical} vertical")
-                companies = await self.research_companies(vertical)
-
-                # Step 2: Find decision makers for each company
-                for company in companies[:5]:  # Limit to 5 per vertical for daily batch
-                    decision_makers = await self.find_decision_makers(company, vertical)
-
-                    if decision_makers:
-                        leads.append({
-                            "company": company,
-                            "vertical": vertical,
-                            "contacts": decision_makers,
-                            "research_date": date.today().isoformat(),
-                            "qualification_score": self.calculate_qualification_score(company)
-                        })
-
-            # Step 3: Prioritize leads
-            leads = sorted(leads, key=lambda x: x["qualification_score"], reverse=True)
+            # Step 1: Research companies in every vertical concurrently
+            companies_by_vertical = await self.fan_out(
+                self.research_companies, self.target_verticals, RESEARCH_CONCURRENCY
+            )
+
+            # Step 2: Find decision makers for each company, all companies at once
+            targets = [
+                (company, vertical)
+                for vertical, companies in zip(self.target_verticals, companies_by_vertical)
+                for company in companies[:5]  # Limit to 5 per vertical for daily batch
+            ]
+            contacts = await self.fan_out(
+                lambda target: self.find_decision_makers(*target), targets, CONTACT_CONCURRENCY
+            )
+
+            for (company, vertical), decision_makers in zip(targets, contacts):
+                if decision_makers:
+                    leads.append(Lead(company, vertical, decision_makers, research_date))
+
+            # Score the whole batch in one vectorized call
+            scores = self.calculate_qualification_scores([lead.company for lead in leads])
+            for lead, score in zip(leads, scores.tolist()):
+                lead.qualification_score = score
+
+            # Step 3: Prioritize leads - only the top ones are kept, so select rather than sort
+            top_leads = heapq.nlargest(
+                max(self.daily_lead_target, 25), leads, key=attrgetter("qualification_score")
+            )
 
             # Step 4: Save results
             self.save_context(task_id, {
                 "leads_generated": len(leads),
                 "verticals_covered": len(self.target_verticals),
-                "leads": leads[:self.daily_lead_target]  # Top 25 leads
+                "leads": top_leads[:self.daily_lead_target]  # Top 25 leads
             })
 
-            # Step 5: Generate summary report
+            # Step 5: Push the saved leads to the CRM (only when config "crm_sync" is on)
+            await self.push_leads_to_crm(top_leads[:self.daily_lead_target])
+
+            # Step 6: Generate summary report
             summary = {
                 "success": True,
                 "task_id": task_id,
                 "leads_generated": len(leads),
-                "top_leads": leads[:10],
-                "next_actions": self.generate_next_actions(leads[:25])
+                "top_leads": top_leads[:10],
+                "next_actions": self.generate_next_actions(top_leads[:25])
             }
 
-            self.logger.info(f"✅ Generated {len(leads)} leads for {len(self.target_verticals)} verticals")
+            self.logger.info("✅ Generated %d leads for %d verticals", len(leads), len(self.target_verticals))
             self.log_metric("leads_generated_today", len(leads))
 
             return summary
 
         except Exception as e:
-            self.logger.error(f"❌ Lead generation failed: {str(e)}")
+            self.logger.error("❌ Lead generation failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -101,107 +206,110 @@ class LeadGenerationAgent(BaseAgent):
 
     async def research_companies(self, vertical: str) -> List[Dict[str, str]]:
         """Research target companies in a vertical using GTM plan data"""
-        self.logger.info(f"🔍 Researching companies in {vertical}")
+        self.logger.info("🔍 Researching companies in %s", vertical)
 
         # Load companies from GTM plan
         gtm_file = self.gtm_plans_dir / vertical / "GTM-PLAN.md"
 
         if not gtm_file.exists():
-            self.logger.warning(f"GTM plan not found for {vertical}")
+            self.logger.warning("GTM plan not found for %s", vertical)
             return []
 
-        # Parse GTM plan for target companies
-        companies = self.parse_target_companies(gtm_file, vertical)
+        # Parse GTM plan for target companies - file I/O runs in a worker thread
+        # so the other verticals' reads and lookups overlap with it
+        companies = await asyncio.to_thread(self.parse_target_companies, gtm_file, vertical)
 
         # Simulate company research (in production, use Perplexity MCP or web search)
         return companies[:10]  # Return top 10 companies
 
     def parse_target_companies(self, gtm_file: Path, vertical: str) -> List[Dict[str, str]]:
-        """Parse target companies from GTM plan markdown"""
-        companies = []
-
+        """Parse target companies from GTM plan markdown (cached until the plan file changes)"""
         try:
-            with open(gtm_file, 'r') as f:
-                content = f.read()
-
-            # Extract company names based on vertical-specific patterns
-            if "healthcare" in vertical:
-                # Look for healthcare company mentions
-                company_patterns = [
-                    "CityMD", "MinuteClinic", "Aspen Dental", "Heartland Dental",
-                    "VCA", "Banfield", "Brookdale", "Five Star"
-                ]
-            elif "retail" in vertical:
-                company_patterns = [
-                    "CVS", "Walgreens", "7-Eleven", "Wawa", "Target"
-                ]
-            elif "banking" in vertical:
-                company_patterns = [
-                    "Navy Federal", "PenFed", "Alliant Credit Union",
-                    "SchoolsFirst Federal Credit Union"
-                ]
-            elif "education" in vertical:
-                company_patterns = [
-                    "Los Angeles Unified", "Chicago Public Schools",
-                    "Miami-Dade County Public Schools"
-                ]
-            else:
-                company_patterns = []
-
-            for company in company_patterns:
-                companies.append({
-                    "name": company,
-                    "vertical": vertical,
-                    "source": "gtm_plan"
-                })
-
+            return list(_parse_gtm_cached(str(gtm_file), gtm_file.stat().st_mtime_ns, vertical))
         except Exception as e:
-            self.logger.error(f"Error parsing GTM plan: {str(e)}")
-
-        return companies
+            self.logger.error("Error parsing GTM plan: %s", e)
+            return []
 
     async def find_decision_makers(self, company: Dict[str, str], vertical: str) -> List[Dict[str, str]]:
         """Find decision makers at target company"""
         # In production, integrate with LinkedIn Sales Navigator, ZoomInfo, etc.
         # For now, return typical decision maker profiles based on vertical
 
-        decision_makers = []
-
-        if "healthcare" in vertical:
-            roles = ["CIO", "VP of IT", "CISO", "COO"]
-        elif "retail" in vertical:
-            roles = ["CIO", "VP of IT", "Director of Store Operations"]
-        elif "banking" in vertical:
-            roles = ["CIO", "CISO", "VP of Technology", "Chief Technology Officer"]
-        else:
-            roles = ["CIO", "VP of IT", "Director of Technology"]
-
-        for role in roles:
-            decision_makers.append({
-                "role": role,
-                "company": company["name"],
-                "vertical": vertical,
-                "status": "to_contact"
-            })
-
-        return decision_makers
+        name = company["name"]
+        return [
+            {"role": role, "company": name, "vertical": vertical, "status": "to_contact"}
+            for role in VERTICAL_ROLES.get(vertical, DEFAULT_ROLES)
+        ]
 
     def calculate_qualification_score(self, company: Dict[str, str]) -> float:
         """Calculate lead qualification score (0-100)"""
-        # Simple scoring model - enhance with firmographic data
-        base_score = 50.0
+        return float(self.calculate_qualification_scores([company])[0])
 
+    def calculate_qualification_scores(self, companies: Sequence[Mapping[str, str]]) -> np.ndarray:
+        """Calculate qualification scores (0-100) for a batch of companies"""
+        # Simple scoring model - enhance with firmographic data
         # Higher score for priority verticals
-        if company["vertical"] in ["healthcare", "retail-chains"]:
-            base_score += 20.0
+        priority_flags = np.fromiter(
+            (c["vertical"] in PRIORITY_VERTICALS for c in companies),
+            dtype=np.int8, count=len(companies)
+        )
 
         # Add randomization to simulate varied lead quality
-        import random
-        score = base_score + random.uniform(-10, 30)
+        return lead_scores(priority_flags, _rng.uniform(-10, 30, size=len(companies)))
+
+    async def push_leads_to_crm(self, leads: Sequence[Lead]) -> int:
+        """Upsert CRM company records for leads in bulk requests, returns the number synced"""
+        if not self.config.get("crm_sync") or not leads:
+            return 0
+        api_key = os.getenv("HUBSPOT_API_KEY")
+        if not api_key:
+            self.logger.warning("⚠️ CRM sync enabled but HUBSPOT_API_KEY is not set")
+            return 0
+
+        size = self.config.get("crm_batch_size", HUBSPOT_MAX_BATCH_SIZE)
+        if not isinstance(size, int) or not 1 <= size <= HUBSPOT_MAX_BATCH_SIZE:
+            self.logger.warning("⚠️ Invalid crm_batch_size %r, using %d", size, HUBSPOT_MAX_BATCH_SIZE)
+            size = HUBSPOT_MAX_BATCH_SIZE
+
+        chunks = [leads[i:i + size] for i in range(0, len(leads), size)]
+        push = functools.partial(self._push_batch, api_key=api_key,
+                                 id_property=self.config.get("crm_id_property", DEFAULT_CRM_ID_PROPERTY))
+        synced = sum(await self.fan_out(push, chunks))
+
+        self.logger.info("📊 Synced %d of %d leads to CRM in %d requests", synced, len(leads), len(chunks))
+        return synced
+
+    async def _push_batch(self, leads: Sequence[Lead], api_key: str, id_property: str) -> int:
+        """Send one bulk upsert request for a chunk of leads, returns the records HubSpot accepted"""
+        payload = {"inputs": [
+            {
+                "idProperty": id_property,
+                "id": f"{lead.vertical}:{lead.company['name']}",
+                "properties": {
+                    "name": lead.company["name"],
+                    "description": f"{lead.vertical} lead - qualification score {lead.qualification_score:.0f}"
+                }
+            }
+            for lead in leads
+        ]}
+        try:
+            session = await self.http_session()
+            async with self._host_slot(HUBSPOT_BATCH_HOST), session.post(
+                HUBSPOT_BATCH_URL, json=payload, headers={"Authorization": f"Bearer {api_key}"}
+            ) as resp:
+                resp.raise_for_status()
+                body = await resp.json()
+        except Exception as e:
+            self.logger.error("❌ CRM batch of %d leads failed: %s", len(leads), e)
+            return 0
 
-        return min(100.0, max(0.0, score))
+        # 207 Multi-Status: some records were rejected, the rest are in results
+        errors = body.get("errors") or ()
+        if errors:
+            self.logger.error("❌ CRM rejected %d of %d leads: %s", len(errors), len(leads), errors[0].get("message"))
+        return len(body.get("results") or ())
 
-    def generate_next_actions(self, leads: List[Dict]) -> List[str]:
+    def generate_next_actions(self, leads: List[Lead]) -> List[str]:
         """Generate recommended next actions for sales team"""
         actions = []
 
@@ -209,7 +317,7 @@ class LeadGenerationAgent(BaseAgent):
             actions.append(f"📧 Send personalized outreach to top {min(10, len(leads))} leads")
             actions.append(f"📞 Schedule discovery calls with qualified prospects")
             actions.append(f"📊 Update CRM with lead intelligence and research")
-            actions.append(f"🎯 Prioritize {leads[0]['vertical']} vertical based on lead quality")
+            actions.append(f"🎯 Prioritize {leads[0].vertical} vertical based on lead quality")
 
         return actions
 
@@ -220,8 +328,11 @@ class LeadGenerationAgent(BaseAgent):
 async def main():
     """Test lead generation agent"""
     agent = LeadGenerationAgent()
-    results = await agent.run()
+    try:
+        results = await agent.run()
+    finally:
+        await agent.aclose()
     print(agent.generate_report(results))
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
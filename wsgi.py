@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+WSGI entrypoint for the AI Agent Dashboard
+Run with: gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:11050 wsgi:app
+Each open /api/events stream holds one of the 32 threads until it recycles (EVENTS_MAX_LIFETIME)
+"""
+from dashboard.agent_dashboard import app
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=11050)